@@ -0,0 +1,121 @@
+"""
+Concurrent-request throughput benchmark.
+
+Two modes:
+
+  simulate  No server or database needed. Runs N concurrent "requests" on one
+            event loop, each making a blocking call that sleeps for --latency
+            seconds (a stand-in for a mysql.connector round trip). Compares the
+            old pattern (blocking call inside `async def`) with the new one
+            (call offloaded to the DB thread pool).
+
+  http      Drives a running API (e.g. `uvicorn main:app`) with --concurrency
+            parallel clients. Run it once on the old commit and once on the new
+            one to compare.
+
+Usage:
+    python benchmarks/bench_concurrency.py simulate --requests 200 --concurrency 50
+    python benchmarks/bench_concurrency.py http --url http://localhost:8000/jobs/ --requests 500
+"""
+import argparse
+import asyncio
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def blocking_query(latency: float):
+    time.sleep(latency)
+    return {"status": "ok"}
+
+
+async def blocking_handler(latency: float):
+    # What `log_analytics` used to do: a sync DB call inside `async def`
+    return blocking_query(latency)
+
+
+async def offloaded_handler(executor, latency: float):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, blocking_query, latency)
+
+
+async def drive(handler, total: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await handler()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return time.perf_counter() - start
+
+
+def run_simulation(args):
+    executor = ThreadPoolExecutor(max_workers=args.pool_size)
+
+    blocking = asyncio.run(drive(lambda: blocking_handler(args.latency), args.requests, args.concurrency))
+    offloaded = asyncio.run(drive(lambda: offloaded_handler(executor, args.latency), args.requests, args.concurrency))
+    executor.shutdown()
+
+    print(f"requests={args.requests} concurrency={args.concurrency} latency={args.latency * 1000:.0f}ms pool={args.pool_size}")
+    print(f"blocking in event loop : {blocking:7.2f}s  {args.requests / blocking:8.1f} req/s")
+    print(f"offloaded to DB threads: {offloaded:7.2f}s  {args.requests / offloaded:8.1f} req/s")
+    print(f"speedup: {blocking / offloaded:.1f}x")
+
+
+def run_http(args):
+    def fetch(_):
+        start = time.perf_counter()
+        request = urllib.request.Request(args.url, method=args.method, data=args.body.encode() if args.body else None)
+        if args.body:
+            request.add_header("Content-Type", "application/json")
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+                ok = 200 <= response.status < 300
+        except Exception:
+            ok = False
+        return ok, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(fetch, range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for _, latency in results)
+    failures = sum(1 for ok, _ in results if not ok)
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+
+    print(f"{args.method} {args.url} requests={args.requests} concurrency={args.concurrency}")
+    print(f"elapsed={elapsed:.2f}s  throughput={args.requests / elapsed:.1f} req/s  failures={failures}")
+    print(f"p50={p50 * 1000:.1f}ms  p99={p99 * 1000:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    sim = sub.add_parser("simulate")
+    sim.add_argument("--requests", type=int, default=200)
+    sim.add_argument("--concurrency", type=int, default=50)
+    sim.add_argument("--latency", type=float, default=0.02, help="seconds per simulated query")
+    sim.add_argument("--pool-size", type=int, default=10)
+
+    http = sub.add_parser("http")
+    http.add_argument("--url", default="http://localhost:8000/jobs/")
+    http.add_argument("--method", default="GET")
+    http.add_argument("--body", default=None, help='JSON body, e.g. \'{"path": "/"}\'')
+    http.add_argument("--requests", type=int, default=500)
+    http.add_argument("--concurrency", type=int, default=20)
+
+    args = parser.parse_args()
+    if args.mode == "simulate":
+        run_simulation(args)
+    else:
+        run_http(args)
+
+
+if __name__ == "__main__":
+    main()
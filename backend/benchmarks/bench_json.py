@@ -0,0 +1,92 @@
+"""
+Encoding cost of a /jobs page: FastAPI's response_model path (validate rows into
+JobSummary, dump back to JSON-able dicts, json.dumps) vs utils.json_response,
+which encodes the dicts from database/queries.py once.
+
+Also checks both produce identical bytes, for list pages and a /jobs/{id} body.
+
+Usage:
+    python benchmarks/bench_json.py --rows 100 --repeat 200
+"""
+import sys
+import os
+import json
+import time
+import argparse
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import BaseModel, TypeAdapter
+from models.job import Job, JobSummary
+from utils import json_response
+from bench_list_payload import make_rows
+
+
+class JobListResponse(BaseModel):
+    # Mirrors routes/jobs.py without importing the database layer
+    data: List[JobSummary]
+    total: Optional[int]
+    total_is_estimate: bool = False
+    page: Optional[int]
+    page_size: int
+    next_cursor: Optional[str] = None
+
+
+def response_model_path(adapter: TypeAdapter, payload: dict) -> bytes:
+    # fastapi.routing.serialize_response + JSONResponse.render
+    model = adapter.validate_python(payload)
+    content = adapter.dump_python(model, mode="json", exclude_unset=True)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    detail = {k: v for k, v in rows[0].items() if k != "description_snippet"}
+    list_rows = [{k: v for k, v in row.items() if k != "description_html"} for row in rows]
+    payload = {
+        "data": list_rows,
+        "total": 1000,
+        "total_is_estimate": False,
+        "page": 1,
+        "page_size": args.rows,
+        "next_cursor": None,
+    }
+    projected = {**payload, "data": [{"id": r["id"], "title": r["title"], "last_seen": r["last_seen"]} for r in list_rows]}
+
+    list_adapter = TypeAdapter(JobListResponse)
+    job_adapter = TypeAdapter(Job)
+    assert response_model_path(list_adapter, payload) == json_response.dumps(payload)
+    assert response_model_path(list_adapter, projected) == json_response.dumps(projected)
+    assert response_model_path(job_adapter, detail) == json_response.dumps(detail)
+    assert response_model_path(list_adapter, payload) == json_response.stdlib_dumps(payload)
+
+    encoders = [
+        ("response_model", lambda: response_model_path(list_adapter, payload)),
+        ("stdlib", lambda: json_response.stdlib_dumps(payload)),
+    ]
+    if json_response.orjson is not None:
+        encoders.append(("orjson", lambda: json_response.orjson.dumps(payload)))
+
+    print(f"rows={args.rows} repeat={args.repeat} (output bytes identical)")
+    baseline = None
+    for name, fn in encoders:
+        elapsed = timed(fn, args.repeat)
+        baseline = baseline or elapsed
+        print(f"{name:16} {elapsed * 1000:8.3f}ms  {baseline / elapsed:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
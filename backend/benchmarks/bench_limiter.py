@@ -0,0 +1,95 @@
+"""
+Rate limiter overhead per check, and whether a limit holds across processes.
+
+  overhead  Times `limiter.hit` for memory:// fixed-window (the old setup),
+            shm:// fixed-window and shm:// token-bucket, over many client keys.
+  workers   Starts N processes that each try to spend the same client's
+            30/minute limit; with shared storage only 30 hits succeed in total.
+
+Usage:
+    python benchmarks/bench_limiter.py overhead --checks 100000
+    python benchmarks/bench_limiter.py workers --processes 4
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import STRATEGIES
+
+import utils.rate_limit_storage  # noqa: F401  registers shm:// and token-bucket
+
+LIMIT = parse("30/minute")
+
+
+def make_limiter(uri: str, strategy: str):
+    return STRATEGIES[strategy](storage_from_string(uri))
+
+
+def run_overhead(args):
+    path = os.path.join(tempfile.mkdtemp(), "bench-ratelimit")
+    setups = [
+        ("memory:// fixed-window", "memory://", "fixed-window"),
+        ("shm:// fixed-window", f"shm://{path}-fw", "fixed-window"),
+        ("shm:// token-bucket", f"shm://{path}-tb", "token-bucket"),
+    ]
+    keys = [f"10.0.{i // 256}.{i % 256}" for i in range(args.clients)]
+
+    print(f"checks={args.checks} clients={args.clients}")
+    for name, uri, strategy in setups:
+        limiter = make_limiter(uri, strategy)
+        start = time.perf_counter()
+        for i in range(args.checks):
+            limiter.hit(LIMIT, "list_jobs", keys[i % len(keys)])
+        elapsed = time.perf_counter() - start
+        print(f"{name:24} {elapsed / args.checks * 1e6:7.2f} µs/check")
+
+
+def spend(uri: str, attempts: int, results):
+    limiter = make_limiter(uri, "token-bucket")
+    results.put(sum(limiter.hit(LIMIT, "list_jobs", "203.0.113.7") for _ in range(attempts)))
+
+
+def run_workers(args):
+    uri = f"shm://{os.path.join(tempfile.mkdtemp(), 'bench-ratelimit-workers')}"
+    make_limiter(uri, "token-bucket").storage.reset()
+
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=spend, args=(uri, LIMIT.amount, results)) for _ in range(args.processes)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    allowed = sum(results.get() for _ in processes)
+
+    print(f"processes={args.processes} limit={LIMIT.amount}/minute per client")
+    print(f"allowed {allowed} of {args.processes * LIMIT.amount} attempts "
+          f"(per-process memory:// would allow {args.processes * LIMIT.amount})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    overhead = sub.add_parser("overhead")
+    overhead.add_argument("--checks", type=int, default=100000)
+    overhead.add_argument("--clients", type=int, default=1000)
+
+    workers = sub.add_parser("workers")
+    workers.add_argument("--processes", type=int, default=4)
+
+    args = parser.parse_args()
+    if args.mode == "overhead":
+        run_overhead(args)
+    else:
+        run_workers(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Payload size and serialization cost of a /jobs page: full `Job` rows (with
+description_html, what /jobs returned before) vs the `JobSummary` projection.
+
+Runs offline on synthetic rows shaped like the crawler's output, through the
+same validate + serialize steps FastAPI applies to the response model.
+
+Usage:
+    python benchmarks/bench_list_payload.py --rows 100 --repeat 200
+"""
+import sys
+import os
+import json
+import gzip
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import BaseModel, TypeAdapter
+from models.job import Job, JobSummary
+
+WORDS = (
+    "we are looking for a software engineer to build reliable services python go "
+    "react typescript aws kubernetes mentor team customers payments platform data "
+    "design review ownership collaborate product roadmap scale testing"
+).split()
+TECHS = ["Python", "Go", "React", "TypeScript", "AWS", "Kubernetes", "SQL", "Java", "Docker", "GraphQL"]
+
+
+class FullPage(BaseModel):
+    data: List[Job]
+    total: int
+    page: int
+    page_size: int
+
+
+class SlimPage(BaseModel):
+    data: List[JobSummary]
+    total: int
+    page: int
+    page_size: int
+
+
+def make_description(rng: random.Random) -> str:
+    paragraphs = []
+    for _ in range(rng.randint(15, 35)):
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(12, 30)))
+        paragraphs.append(f"<p>{sentence.capitalize()}.</p>" if rng.random() < 0.6 else f"<p>&bull; {sentence}</p>")
+    return "\n".join(paragraphs)
+
+
+def make_rows(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    now = datetime(2025, 6, 1)
+    rows = []
+    for i in range(count):
+        html = make_description(rng)
+        rows.append({
+            "id": f"00000000-0000-0000-0000-{i:012d}",
+            "company": rng.choice(["Neo", "Bold", "Payworks", "Priceline", "Pollard"]),
+            "title": "Senior Software Engineer",
+            "location": "Winnipeg, MB",
+            "job_type": "Full Time",
+            "description_html": html,
+            "description_snippet": " ".join(html.replace("<p>", " ").replace("</p>", " ").split())[:200],
+            "link": f"https://example.com/jobs/{i}",
+            "salary_min": 90000,
+            "salary_max": 130000,
+            "work_model": rng.choice(["remote", "on-site", "hybrid"]),
+            "industry": "Fintech",
+            "seniority": rng.choice(["entry", "mid", "senior", "lead"]),
+            "technologies": rng.sample(TECHS, rng.randint(2, 6)),
+            "is_winnipeg": 1,
+            "department": "software_engineering",
+            "min_experience": rng.randint(0, 8),
+            "archived": 0,
+            "last_seen": now - timedelta(hours=i),
+            "date_added": now - timedelta(days=i),
+        })
+    return rows
+
+
+def serialize(adapter: TypeAdapter, payload: dict) -> bytes:
+    # What FastAPI does with a response_model: validate, dump to JSON-able, json.dumps
+    model = adapter.validate_python(payload)
+    return json.dumps(adapter.dump_python(model, mode="json", exclude_unset=True)).encode()
+
+
+def measure(adapter, payload, repeat):
+    body = serialize(adapter, payload)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        serialize(adapter, payload)
+    elapsed = (time.perf_counter() - start) / repeat
+    return len(body), len(gzip.compress(body)), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    page = {"total": 1000, "page": 1, "page_size": args.rows}
+
+    full_rows = [{k: v for k, v in row.items() if k != "description_snippet"} for row in rows]
+    slim_rows = [{k: v for k, v in row.items() if k != "description_html"} for row in rows]
+
+    full = measure(TypeAdapter(FullPage), {**page, "data": full_rows}, args.repeat)
+    slim = measure(TypeAdapter(SlimPage), {**page, "data": slim_rows}, args.repeat)
+
+    print(f"rows={args.rows} repeat={args.repeat}")
+    print(f"{'':10} {'bytes':>10} {'gzip':>10} {'serialize':>12}")
+    for name, (raw, gz, elapsed) in (("full", full), ("summary", slim)):
+        print(f"{name:10} {raw:>10} {gz:>10} {elapsed * 1000:>10.2f}ms")
+    print(f"reduction: {1 - slim[0] / full[0]:.0%} bytes, {1 - slim[1] / full[1]:.0%} gzip bytes, "
+          f"{1 - slim[2] / full[2]:.0%} serialize time")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Query cost of the in-memory job snapshot (database/snapshot.py) on synthetic
+active jobs: one /jobs page with its total, and a full /filters facet set.
+
+Titles are near-unique and locations varied, as on real careers pages, so
+the index build and size reflect the high-cardinality fields. Each query's
+results are checked against a plain Python filter over the same rows, so this
+doubles as a sanity check of the indexes.
+
+Usage:
+    python benchmarks/bench_snapshot.py --jobs 5000 --repeat 2000
+"""
+import sys
+import os
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.snapshot import JobIndex
+from database.queries import FACETS, facet_filters_for
+from bench_list_payload import make_rows
+
+QUERIES = {
+    "no filters": {},
+    "company + seniority": {"company": ["neo", "Bold"], "seniority": ["senior"]},
+    "technologies (all)": {"technologies": ["python", "aws"]},
+    "technologies (any)": {"technologies": ["go", "react"], "tech_match": "any"},
+    "remote + salary + swe": {"work_model": ["remote"], "salary_min": 100000, "is_swe": True},
+    "location": {"location": ["toronto, on"]},
+}
+
+LEVELS = ["Junior", "Intermediate", "Senior", "Staff", "Principal", "Lead"]
+ROLES = ["Software Engineer", "Backend Developer", "Data Analyst", "Product Designer",
+         "Account Executive", "QA Engineer", "Site Reliability Engineer", "Product Manager"]
+TEAMS = ["Payments", "Platform", "Growth", "Mobile", "Risk", "Search", "Billing", "Identity"]
+CITIES = ["Winnipeg, MB", "Toronto, ON", "Vancouver, BC", "Montreal, QC", "Calgary, AB", "Remote - Canada"]
+
+
+def index_size(index) -> int:
+    """Approximate bytes held by the bitsets and position lists."""
+    size = sum(bits.bit_length() // 8 for values in index.bitsets.values() for bits in values.values())
+    size += sum(bits.bit_length() // 8 for bits in index.technologies.values())
+    size += sum(8 * len(positions) for values in index.positions.values() for positions in values.values())
+    return size
+
+
+def reference(rows, tech_match="all", technologies=None, is_swe=None, is_winnipeg=None, **filters):
+    """The same filters as plain comparisons, in listing order."""
+    techs = {tech.lower() for tech in technologies or []}
+    matched = []
+    for row in rows:
+        row_techs = {tech.lower() for tech in row["technologies"]}
+        if any(values and str(row[param]).casefold() not in {v.casefold() for v in values}
+               for param, values in filters.items() if isinstance(values, list)):
+            continue
+        if filters.get("salary_min") is not None and (row["salary_min"] or 0) < filters["salary_min"]:
+            continue
+        if is_swe and row["department"] != "software_engineering":
+            continue
+        if techs and not (techs & row_techs if tech_match == "any" else techs <= row_techs):
+            continue
+        matched.append(row)
+    return matched
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    rows = make_rows(args.jobs)
+    for row in rows:
+        del row["description_html"]
+        row["salary_min"] = rng.choice([None, 60000, 90000, 120000])
+        row["department"] = rng.choice(["software_engineering", "design", "sales", None])
+        row["title"] = f"{rng.choice(LEVELS)} {rng.choice(ROLES)}, {rng.choice(TEAMS)} (R{rng.randint(10000, 99999)})"
+        row["location"] = rng.choice(CITIES)
+    QUERIES["title"] = {"title": [rows[len(rows) // 2]["title"]]}
+
+    start = time.perf_counter()
+    index = JobIndex(rows, generation=1)
+    print(f"jobs={args.jobs} repeat={args.repeat} index build {(time.perf_counter() - start) * 1000:.1f}ms"
+          f" size ~{index_size(index) / 1024:.0f} KiB")
+
+    for name, filters in QUERIES.items():
+        expected = reference(index.rows, **filters)
+        bits = index.match(**filters)
+        page, _ = index.page(bits, 0, 20)
+        assert bits.bit_count() == len(expected) and page == expected[:20], name
+
+        def listing():
+            bits = index.match(**filters)
+            index.page(bits, 0, 20)
+            return bits.bit_count()
+
+        def facets():
+            for column, param in FACETS.values():
+                index.facet_counts(column, index.match(**facet_filters_for(filters, param)))
+
+        print(f"{name:24} matches={len(expected):5}  page+total {timed(listing, args.repeat) * 1e6:7.1f}µs"
+              f"  facets {timed(facets, args.repeat) * 1e6:7.1f}µs")
+
+
+if __name__ == "__main__":
+    main()
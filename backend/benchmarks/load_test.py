@@ -0,0 +1,295 @@
+"""
+Load test for a running API: a weighted mix of /jobs (varied filter
+combinations, offset and cursor pages, search, fields=), /jobs/{id},
+/filters and /analytics at a fixed concurrency. Reports requests per second
+and p50/p95/p99 latency per endpoint, and writes them to a JSON file that
+`--compare` can diff against another run.
+
+Rate limits would turn most of the run into 429s, so start the server with
+them off. Point it at a database filled by seed_jobs.py:
+
+    DATABASE_URL=$BENCH_DATABASE_URL RATELIMIT_ENABLED=false uvicorn main:app --workers 4
+
+Usage:
+    python benchmarks/load_test.py --duration 30 --concurrency 32 --label snapshot
+    python benchmarks/load_test.py --duration 30 --bust-cache     # bypass the response cache
+    python benchmarks/load_test.py --compare results/a.json results/b.json
+"""
+import os
+import gzip
+import json
+import time
+import random
+import argparse
+import threading
+import subprocess
+import urllib.request
+import urllib.error
+from urllib.parse import urlencode
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# endpoint -> share of requests
+MIX = {
+    "GET /jobs": 55,
+    "GET /jobs/{id}": 20,
+    "GET /filters": 15,
+    "POST /analytics": 10,
+}
+PERCENTILES = (50, 95, 99)
+TECHNOLOGIES = ["python", "javascript", "typescript", "react", "sql", "aws", "java", "docker", "go", "kubernetes"]
+SEARCH_TERMS = ["engineer", "payments platform", "react", "data infrastructure", "mentor", "security"]
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return "unknown"
+
+
+class Client:
+    def __init__(self, base_url: str, bust_cache: bool):
+        self.base_url = base_url.rstrip("/")
+        self.bust_cache = bust_cache
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def request(self, method: str, path: str, params=None, body=None):
+        params = list(params or [])
+        if self.bust_cache and method == "GET":
+            with self._lock:
+                self._counter += 1
+                params.append(("_", self._counter))
+        url = f"{self.base_url}{path}" + (f"?{urlencode(params)}" if params else "")
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(url, method=method, data=data)
+        request.add_header("Accept-Encoding", "gzip")
+        if data is not None:
+            request.add_header("Content-Type", "application/json")
+
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                payload = response.read()
+                status = response.status
+                if response.headers.get("Content-Encoding") == "gzip":
+                    payload = gzip.decompress(payload)
+        except urllib.error.HTTPError as e:
+            payload, status = e.read(), e.code
+        except Exception:
+            payload, status = b"", 0
+        return status, time.perf_counter() - start, payload
+
+
+class Workload:
+    """Builds requests from ids and filter values discovered on the running API."""
+
+    def __init__(self, client: Client, rng: random.Random):
+        self.client = client
+        self.rng = rng
+        self.job_ids = []
+        self.options = {}
+        self.cursors = []
+
+    def discover(self):
+        status, _, body = self.client.request("GET", "/jobs/", [("limit", 100), ("fields", "id"), ("count", "none")])
+        if status != 200:
+            raise SystemExit(f"❌ GET /jobs/ returned {status}, is the API running with rate limits off?")
+        page = json.loads(body)
+        self.job_ids = [job["id"] for job in page["data"]]
+        if page.get("next_cursor"):
+            self.cursors.append(page["next_cursor"])
+
+        status, _, body = self.client.request("GET", "/filters")
+        facets = json.loads(body) if status == 200 else {}
+        self.options = {
+            param: [option["id"] for option in facets.get(facet, [])]
+            for facet, param in (("seniority", "seniority"), ("workModels", "work_model"),
+                                 ("departments", "department"), ("jobTypes", "job_type"))
+        }
+        status, _, body = self.client.request("GET", "/companies/")
+        self.options["company"] = json.loads(body) if status == 200 else []
+        print(f"🔎 Discovered {len(self.job_ids)} job ids, "
+              + ", ".join(f"{len(values)} {param}" for param, values in self.options.items()))
+
+    def random_filters(self) -> list:
+        params = []
+        for param, values in self.options.items():
+            if values and self.rng.random() < 0.3:
+                for value in self.rng.sample(values, self.rng.randint(1, min(2, len(values)))):
+                    params.append((param, value))
+        roll = self.rng.random()
+        if roll < 0.15:
+            for tech in self.rng.sample(TECHNOLOGIES, self.rng.randint(1, 3)):
+                params.append(("technologies", tech))
+        elif roll < 0.25:
+            params.append(("salary_min", self.rng.choice([60000, 80000, 100000])))
+        elif roll < 0.35:
+            params.append(("is_winnipeg", "true"))
+        return params
+
+    def jobs_list(self):
+        params = self.random_filters()
+        roll = self.rng.random()
+        if roll < 0.1:
+            params.append(("q", self.rng.choice(SEARCH_TERMS)))
+        elif roll < 0.3 and self.cursors:
+            params = [("cursor", self.rng.choice(self.cursors))]
+        elif roll < 0.5:
+            params.append(("offset", self.rng.choice([20, 40, 100, 200])))
+        if self.rng.random() < 0.2:
+            params.append(("fields", "id,title,company,last_seen"))
+        params.append(("limit", self.rng.choice([20, 20, 50, 100])))
+        status, elapsed, body = self.client.request("GET", "/jobs/", params)
+        if status == 200 and len(self.cursors) < 50:
+            cursor = json.loads(body).get("next_cursor")
+            if cursor:
+                self.cursors.append(cursor)
+        return status, elapsed
+
+    def job_detail(self):
+        job_id = self.rng.choice(self.job_ids) if self.job_ids else "missing"
+        status, elapsed, _ = self.client.request("GET", f"/jobs/{job_id}")
+        return status, elapsed
+
+    def filters(self):
+        status, elapsed, _ = self.client.request("GET", "/filters", self.random_filters())
+        return status, elapsed
+
+    def analytics(self):
+        path = self.rng.choice(["/", "/jobs", f"/jobs/{self.rng.choice(self.job_ids or ['x'])}", "/about"])
+        status, elapsed, _ = self.client.request("POST", "/analytics", body={"path": path})
+        return status, elapsed
+
+    def handlers(self):
+        return {
+            "GET /jobs": self.jobs_list,
+            "GET /jobs/{id}": self.job_detail,
+            "GET /filters": self.filters,
+            "POST /analytics": self.analytics,
+        }
+
+
+def run(args):
+    client = Client(args.url, args.bust_cache)
+    workload = Workload(client, random.Random(args.seed))
+    workload.discover()
+    handlers = workload.handlers()
+    names, weights = zip(*MIX.items())
+
+    samples = {name: [] for name in names}
+    statuses = {name: {} for name in names}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.duration
+
+    def worker(worker_id: int):
+        rng = random.Random(args.seed + worker_id)
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            status, elapsed = handlers[name]()
+            with lock:
+                samples[name].append(elapsed)
+                statuses[name][status] = statuses[name].get(status, 0) + 1
+
+    print(f"🚀 {args.url} concurrency={args.concurrency} duration={args.duration}s bust_cache={args.bust_cache}")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for worker_id in range(args.concurrency):
+            pool.submit(worker, worker_id)
+    elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    for name in names:
+        latencies = sorted(samples[name])
+        ok = sum(count for status, count in statuses[name].items() if 200 <= status < 400)
+        endpoints[name] = {
+            "requests": len(latencies),
+            "errors": len(latencies) - ok,
+            "statuses": {str(status): count for status, count in sorted(statuses[name].items())},
+            "rps": round(len(latencies) / elapsed, 1),
+            **{f"p{pct}_ms": round(percentile(latencies, pct) * 1000, 2) for pct in PERCENTILES},
+            "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        }
+    total = sum(endpoint["requests"] for endpoint in endpoints.values())
+
+    result = {
+        "label": args.label,
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "url": args.url,
+        "concurrency": args.concurrency,
+        "duration_s": round(elapsed, 2),
+        "bust_cache": args.bust_cache,
+        "seed": args.seed,
+        "total_rps": round(total / elapsed, 1),
+        "endpoints": endpoints,
+    }
+    print_table(result)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{result['commit']}-{args.label}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"💾 Saved {output}")
+
+
+def print_table(result: dict):
+    print(f"{'endpoint':18} {'reqs':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for name, stats in result["endpoints"].items():
+        print(f"{name:18} {stats['requests']:>7} {stats['errors']:>5} {stats['rps']:>8.1f} "
+              f"{stats['p50_ms']:>6.1f}ms {stats['p95_ms']:>6.1f}ms {stats['p99_ms']:>6.1f}ms {stats['max_ms']:>6.1f}ms")
+    print(f"total {result['total_rps']:.1f} req/s")
+
+
+def compare(base_path: str, new_path: str):
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    def change(old, current):
+        return f"{(current - old) / old:+.0%}" if old else "n/a"
+
+    print(f"base {base['commit']} ({base['label']})  vs  new {new['commit']} ({new['label']})")
+    print(f"{'endpoint':18} {'rps':>18} {'p50 ms':>18} {'p95 ms':>18} {'p99 ms':>18}")
+    for name in base["endpoints"]:
+        old, current = base["endpoints"][name], new["endpoints"].get(name)
+        if current is None:
+            continue
+        cells = []
+        for key in ("rps", "p50_ms", "p95_ms", "p99_ms"):
+            cells.append(f"{old[key]:>6}→{current[key]:<6} {change(old[key], current[key]):>5}")
+        print(f"{name:18} " + " ".join(cells))
+    print(f"{'total':18} {base['total_rps']:>6}→{new['total_rps']:<6} {change(base['total_rps'], new['total_rps']):>5}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--bust-cache", action="store_true", help="add a unique query param so the response cache always misses")
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--output", default=None, help="result file, default results/<commit>-<label>.json")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="diff two result files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+    else:
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
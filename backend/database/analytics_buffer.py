@@ -0,0 +1,121 @@
+import os
+import asyncio
+from database.connection import run_in_db_thread
+from database.queries import insert_page_views
+
+
+class BufferFull(Exception):
+    """Raised when a page view could not be queued within the enqueue timeout."""
+
+
+class PageViewBuffer:
+    """
+    In-process buffer for page_analytics rows.
+
+    Rows are flushed as multi-row INSERTs once `batch_size` rows are pending or
+    every `flush_interval` seconds, whichever comes first. When `max_pending`
+    rows are queued or being written, `add` waits for a flush to make room and
+    gives up with BufferFull after `enqueue_timeout` seconds. `stop` flushes
+    whatever is left.
+
+    created_at is filled by the database at flush time, so it may trail the
+    actual view by up to `flush_interval`.
+    """
+
+    def __init__(self, insert_rows, batch_size: int, flush_interval: float, max_pending: int, enqueue_timeout: float):
+        self.insert_rows = insert_rows
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.enqueue_timeout = enqueue_timeout
+
+        self._pending = []
+        self._in_flight = 0
+        self._space = asyncio.Condition()
+        self._batch_ready = asyncio.Event()
+        self._task = None
+        self._stopping = False
+
+        self.flushed = 0
+        self.failed = 0
+
+    def _has_room(self, count: int) -> bool:
+        return len(self._pending) + self._in_flight + count <= self.max_pending
+
+    async def add_many(self, rows: list):
+        if self._stopping:
+            raise BufferFull("Analytics buffer is shutting down")
+        # A batch larger than the whole buffer could never fit, let it in once the buffer is empty
+        count = min(len(rows), self.max_pending)
+
+        async with self._space:
+            try:
+                await asyncio.wait_for(self._space.wait_for(lambda: self._has_room(count)), self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                raise BufferFull(f"Analytics buffer full ({self.max_pending} rows)")
+            self._pending.extend(rows)
+            if len(self._pending) >= self.batch_size:
+                self._batch_ready.set()
+
+    async def add(self, row: tuple):
+        await self.add_many([row])
+
+    async def flush(self):
+        async with self._space:
+            batch, self._pending = self._pending, []
+            self._in_flight += len(batch)
+            self._batch_ready.clear()
+
+        try:
+            for start in range(0, len(batch), self.batch_size):
+                chunk = batch[start:start + self.batch_size]
+                try:
+                    await run_in_db_thread(self.insert_rows, chunk)
+                    self.flushed += len(chunk)
+                except Exception as e:
+                    self.failed += len(chunk)
+                    print(f"❌ Failed to flush {len(chunk)} page views: {e}")
+        finally:
+            async with self._space:
+                self._in_flight -= len(batch)
+                self._space.notify_all()
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            if self._pending:
+                await self.flush()
+        await self.flush()
+
+    def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stopping = True
+        self._batch_ready.set()
+        await self._task
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "in_flight": self._in_flight,
+            "flushed": self.flushed,
+            "failed": self.failed,
+        }
+
+
+page_view_buffer = PageViewBuffer(
+    insert_page_views,
+    batch_size=int(os.getenv("ANALYTICS_BATCH_SIZE", "200")),
+    flush_interval=float(os.getenv("ANALYTICS_FLUSH_INTERVAL", "2")),
+    max_pending=int(os.getenv("ANALYTICS_MAX_PENDING", "10000")),
+    enqueue_timeout=float(os.getenv("ANALYTICS_ENQUEUE_TIMEOUT", "1")),
+)
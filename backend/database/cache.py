@@ -0,0 +1,104 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from database.connection import get_connection
+
+# How long a read of the crawler's data generation is trusted before re-checking
+GENERATION_TTL = float(os.getenv("DATA_GENERATION_TTL", "5"))
+
+_generation = {"value": None, "checked_at": 0.0}
+_generation_lock = threading.Lock()
+
+
+def read_data_generation(conn) -> int:
+    cursor = conn.cursor()
+    cursor.execute("SELECT generation FROM data_generation WHERE id = 1")
+    row = cursor.fetchone()
+    cursor.close()
+    return row[0] if row else 0
+
+
+def cached_data_generation():
+    """The generation read within GENERATION_TTL, or None if it has to be read again. Never touches MySQL."""
+    with _generation_lock:
+        if _generation["value"] is not None and time.monotonic() - _generation["checked_at"] < GENERATION_TTL:
+            return _generation["value"]
+    return None
+
+
+def get_data_generation(conn=None) -> int:
+    """
+    Current data generation. The crawler bumps it whenever it inserts or
+    archives jobs, so anything cached under an older generation is stale.
+    """
+    now = time.monotonic()
+    cached = cached_data_generation()
+    if cached is not None:
+        return cached
+
+    if conn is not None:
+        value = read_data_generation(conn)
+    else:
+        with get_connection() as conn:
+            value = read_data_generation(conn)
+
+    with _generation_lock:
+        _generation["value"] = value
+        _generation["checked_at"] = now
+    return value
+
+
+class GenerationCache:
+    """
+    Bounded LRU cache whose entries are only valid for the generation they were stored under.
+    Bounded by entry count and, when `max_bytes` is set, by the total `sizeof(value)`.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int = None, sizeof=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda value: 0)
+        self._entries = OrderedDict()  # key -> (generation, value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, generation: int):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != generation:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def get_any(self, key):
+        """Last stored value regardless of generation, for callers that accept stale data."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[1] if entry else None
+
+    def set(self, key, generation: int, value):
+        size = self.sizeof(value)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            self._entries[key] = (generation, value, size)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries
+                                     or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
@@ -1,7 +1,17 @@
 import os
+import time
+import asyncio
+import functools
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from contextlib import contextmanager
 from dotenv import load_dotenv
 from urllib.parse import urlparse
 import mysql.connector
+from mysql.connector import errors
+from utils.metrics import record, timed
 
 load_dotenv()
 
@@ -15,5 +25,203 @@ DB_CONFIG = {
     'database': parsed.path.lstrip('/')
 }
 
+POOL_CONFIG = {
+    'size': int(os.getenv("DB_POOL_SIZE", "10")),
+    'timeout': float(os.getenv("DB_POOL_TIMEOUT", "5")),
+    'recycle': float(os.getenv("DB_POOL_RECYCLE", "1800")),
+    'ping_after': float(os.getenv("DB_POOL_PING_AFTER", "5")),
+}
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection could be checked out within the pool timeout."""
+
+
+class ConnectionPool:
+    """
+    Bounded pool of MySQL connections.
+
+    Connections are opened lazily up to `size`. Idle connections are pinged
+    before being handed out and are replaced once they are older than `recycle`
+    seconds. Callers wait at most `timeout` seconds for a free connection.
+    """
+
+    def __init__(self, config: dict, size: int, timeout: float, recycle: float, ping_after: float):
+        self.config = config
+        self.size = size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.ping_after = ping_after
+
+        self._idle = deque()  # (conn, created_at, returned_at)
+        self._created = {}  # id(conn) -> created_at for checked out connections
+        self._open = 0
+        self._cond = threading.Condition()
+
+        self._checkouts = 0
+        self._timeouts = 0
+        self._recycled = 0
+        self._failed_pings = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _connect(self):
+        return mysql.connector.connect(**self.config)
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_usable(self, conn, created_at: float, returned_at: float) -> bool:
+        now = time.monotonic()
+        if self.recycle and now - created_at > self.recycle:
+            self._recycled += 1
+            return False
+        if now - returned_at >= self.ping_after:
+            try:
+                conn.ping(reconnect=False)
+            except errors.Error:
+                self._failed_pings += 1
+                return False
+        return True
+
+    def acquire(self):
+        start = time.monotonic()
+        deadline = start + self.timeout
+
+        while True:
+            conn = None
+            with self._cond:
+                while not self._idle and self._open >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeout(f"No database connection available after {self.timeout}s")
+                    self._cond.wait(remaining)
+
+                if self._idle:
+                    conn, created_at, returned_at = self._idle.pop()
+                else:
+                    # Reserve the slot, connect outside the lock
+                    self._open += 1
+
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._open -= 1
+                        self._cond.notify()
+                    raise
+                created_at = time.monotonic()
+                break
+
+            if self._is_usable(conn, created_at, returned_at):
+                break
+
+            self._discard(conn)
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+
+        waited = time.monotonic() - start
+        with self._cond:
+            self._created[id(conn)] = created_at
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+        return conn
+
+    def release(self, conn, broken: bool = False):
+        if not broken:
+            try:
+                # Drop any open transaction so the next borrower gets a fresh snapshot
+                if conn.in_transaction:
+                    conn.rollback()
+            except errors.Error:
+                broken = True
+
+        with self._cond:
+            created_at = self._created.pop(id(conn), time.monotonic())
+            if broken:
+                self._open -= 1
+            else:
+                self._idle.append((conn, created_at, time.monotonic()))
+            self._cond.notify()
+
+        if broken:
+            self._discard(conn)
+
+    @contextmanager
+    def connection(self):
+        with timed("db_wait"):
+            conn = self.acquire()
+        checked_out = time.perf_counter()
+        try:
+            yield conn
+        except errors.InterfaceError:
+            self.release(conn, broken=True)
+            raise
+        except BaseException:
+            self.release(conn)
+            raise
+        else:
+            self.release(conn)
+        finally:
+            record("db_query", time.perf_counter() - checked_out)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "size": self.size,
+                "open": self._open,
+                "idle": len(self._idle),
+                "in_use": self._open - len(self._idle),
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "recycled": self._recycled,
+                "failed_pings": self._failed_pings,
+                "wait_seconds_total": round(self._wait_total, 6),
+                "wait_seconds_max": round(self._wait_max, 6),
+            }
+
+    def close(self):
+        with self._cond:
+            idle, self._idle = self._idle, deque()
+            self._open -= len(idle)
+        for conn, _, _ in idle:
+            self._discard(conn)
+
+
+pool = ConnectionPool(DB_CONFIG, **POOL_CONFIG)
+
+
 def get_connection():
-    return mysql.connector.connect(**DB_CONFIG)
+    """
+    Borrow a pooled connection. Use as a context manager:
+
+        with get_connection() as conn:
+            ...
+    """
+    return pool.connection()
+
+
+# Blocking mysql.connector calls run here so they never stall the event loop.
+# One thread per pooled connection: more threads would only queue on the pool.
+db_executor = ThreadPoolExecutor(max_workers=POOL_CONFIG['size'], thread_name_prefix="db")
+
+
+async def run_in_db_thread(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    # Carry the request's context (its timings) into the DB thread
+    context = contextvars.copy_context()
+    submitted = time.perf_counter()
+
+    def call():
+        record("db_wait", time.perf_counter() - submitted)
+        return fn(*args, **kwargs)
+
+    return await loop.run_in_executor(db_executor, functools.partial(context.run, call))
@@ -1,5 +1,139 @@
-from database.connection import get_connection
-import json
+from database.connection import get_connection, run_in_db_thread
+from database.cache import GenerationCache, get_data_generation
+from database.snapshot import JobSnapshot, normalize_row
+from utils.metrics import timed
+from database.utils import encode_cursor, decode_cursor, filter_signature, build_search_query
+import os
+import time
+import zlib
+
+# Low-cardinality columns are stored as ids into lookup tables:
+# column -> (lookup table, id column on jobs / jobs_archive)
+DICTIONARIES = {
+    "company": ("companies", "company_id"),
+    "location": ("locations", "location_id"),
+    "job_type": ("job_types", "job_type_id"),
+    "industry": ("industries", "industry_id"),
+}
+
+def dictionary_value(column: str) -> str:
+    """Name of a dictionary-encoded column, as a primary-key lookup correlated with the outer row."""
+    table, id_column = DICTIONARIES[column]
+    return f"(SELECT name FROM {table} WHERE {table}.id = {id_column})"
+
+# (lookup table, name) -> (id or None, expires_at). Lookup rows are never renamed
+# or deleted, so ids are kept; a name with no row yet is asked again after the TTL.
+DICTIONARY_MISS_TTL = 60
+DICTIONARY_CACHE_SIZE = 10000
+_dictionary_ids = {}
+
+def dictionary_ids(column: str, names: list) -> list:
+    """Ids of `names` in the lookup table of `column`, matched by its (case-insensitive) collation."""
+    table, _ = DICTIONARIES[column]
+    now = time.monotonic()
+    ids, missing = set(), []
+    for name in names:
+        cached = _dictionary_ids.get((table, name))
+        if cached is None or (cached[0] is None and cached[1] < now):
+            missing.append(name)
+        elif cached[0] is not None:
+            ids.add(cached[0])
+
+    if missing:
+        if len(_dictionary_ids) >= DICTIONARY_CACHE_SIZE:
+            _dictionary_ids.clear()
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            for name in missing:
+                cursor.execute(f"SELECT id FROM {table} WHERE name = %s", (name,))
+                rows = cursor.fetchall()
+                _dictionary_ids[(table, name)] = (rows[0][0] if rows else None, now + DICTIONARY_MISS_TTL)
+                if rows:
+                    ids.add(rows[0][0])
+            cursor.close()
+    return sorted(ids)
+
+def dictionary_filter(column: str, names: list):
+    """
+    WHERE clause matching rows whose dictionary-encoded `column` is one of
+    `names`. Filters on literal ids: with a semi-join on the lookup table MySQL
+    may read it first and filesort the page instead of walking the listing index.
+    """
+    _, id_column = DICTIONARIES[column]
+    ids = dictionary_ids(column, names)
+    if not ids:
+        return "FALSE", []
+    placeholders = ','.join(['%s'] * len(ids))
+    return f"{id_column} IN ({placeholders})", ids
+
+# Everything /jobs/{id} returns. description_text only feeds the full-text index.
+# description_html comes back zlib-compressed from the content-addressed job_descriptions.
+JOB_COLUMNS = {
+    "id": "id",
+    "company": f"{dictionary_value('company')} AS company",
+    "title": "title",
+    "location": f"{dictionary_value('location')} AS location",
+    "job_type": f"{dictionary_value('job_type')} AS job_type",
+    "description_html": "(SELECT body FROM job_descriptions WHERE job_descriptions.hash = description_hash) AS description_html",
+    "link": "link",
+    "salary_min": "salary_min",
+    "salary_max": "salary_max",
+    "work_model": "work_model",
+    "industry": f"{dictionary_value('industry')} AS industry",
+    "seniority": "seniority",
+    "technologies": "technologies",
+    "is_winnipeg": "is_winnipeg",
+    "department": "department",
+    "min_experience": "min_experience",
+    "archived": "archived",
+    "last_seen": "last_seen",
+    "date_added": "date_added",
+}
+# jobs_archive has the same columns minus the flag: every row there is archived
+ARCHIVE_JOB_COLUMNS = {**JOB_COLUMNS, "archived": "TRUE AS archived"}
+
+# What /jobs can project (`fields=`). Heavy description_html is left to /jobs/{id},
+# list cards get a short plain-text snippet instead.
+SNIPPET_LENGTH = 200
+LIST_COLUMNS = {
+    "id": "id",
+    "company": JOB_COLUMNS["company"],
+    "title": "title",
+    "location": JOB_COLUMNS["location"],
+    "job_type": JOB_COLUMNS["job_type"],
+    "description_snippet": f"LEFT(description_text, {SNIPPET_LENGTH}) AS description_snippet",
+    "link": "link",
+    "salary_min": "salary_min",
+    "salary_max": "salary_max",
+    "work_model": "work_model",
+    "industry": JOB_COLUMNS["industry"],
+    "seniority": "seniority",
+    "technologies": "technologies",
+    "is_winnipeg": "is_winnipeg",
+    "department": "department",
+    "min_experience": "min_experience",
+    "archived": "archived",
+    "last_seen": "last_seen",
+    "date_added": "date_added",
+}
+
+ARCHIVE_LIST_COLUMNS = {**LIST_COLUMNS, "archived": "TRUE AS archived"}
+
+# Active jobs held in memory for listings, facets and companies (SNAPSHOT_ENABLED=false: always SQL)
+job_snapshot = JobSnapshot(LIST_COLUMNS)
+
+# Totals and facet counts per filter signature, dropped whenever the crawler bumps the data generation
+count_cache = GenerationCache(max_entries=int(os.getenv("COUNT_CACHE_SIZE", "2048")))
+facet_cache = GenerationCache(max_entries=int(os.getenv("FACET_CACHE_SIZE", "512")))
+
+# /filters facet key -> (column, the /jobs filter on that column)
+FACETS = {
+    "seniority": ("seniority", "seniority"),
+    "jobTypes": ("job_type", "job_type"),
+    "workModels": ("work_model", "work_model"),
+    "departments": ("department", "department"),
+    "industries": ("industry", "industry"),
+}
 
 
 def build_where_clauses(filters: dict):
@@ -14,7 +148,11 @@ def build_where_clauses(filters: dict):
                 continue
         if val is None:
             continue
-        if isinstance(val, list) and val:
+        if key in DICTIONARIES and val:
+            clause, ids = dictionary_filter(key, val if isinstance(val, list) else [val])
+            where_clauses.append(clause)
+            values.extend(ids)
+        elif isinstance(val, list) and val:
             placeholders = ','.join(['%s'] * len(val))
             where_clauses.append(f"{key} IN ({placeholders})")
             values.extend(val)
@@ -27,9 +165,9 @@ def build_where_clauses(filters: dict):
 
     return where_clauses, values
 
-def get_jobs(
-    offset=0,
-    limit=20,
+def build_job_filters(
+    q=None,
+    tech_match="all",
     company=None,
     title=None,
     location=None,
@@ -45,6 +183,11 @@ def get_jobs(
     min_experience=None,
     is_swe=None
 ):
+    """
+    WHERE clauses for the /jobs filter set. Returns (where_clauses, values,
+    search, signature) where `search` is the BOOLEAN MODE expression for `q`
+    ("" if none) and `signature` identifies the filter set for caching.
+    """
     filters = {
         "company": company,
         "title": title,
@@ -71,63 +214,361 @@ def get_jobs(
         where_clauses.append("min_experience >= %s")
         values.append(min_experience)
 
-    # Technologies filter: match any
-    if technologies:
-        for tech in technologies:
-            where_clauses.append("technologies LIKE %s")
-            values.append(f"%{tech}%")
+    # Technologies filter: exact, case-insensitive lookups on job_technologies
+    techs = sorted({tech.strip().lower() for tech in technologies or [] if tech.strip()})
+    if techs:
+        placeholders = ','.join(['%s'] * len(techs))
+        if tech_match == "any":
+            where_clauses.append(f"id IN (SELECT job_id FROM job_technologies WHERE technology IN ({placeholders}))")
+            values.extend(techs)
+        else:
+            where_clauses.append(
+                f"id IN (SELECT job_id FROM job_technologies WHERE technology IN ({placeholders}) "
+                f"GROUP BY job_id HAVING COUNT(*) = %s)"
+            )
+            values.extend(techs)
+            values.append(len(techs))
 
-    where_sql = " AND ".join(where_clauses)
+    # Full-text search over title + plain-text description, terms like "c++"
+    # or "node.js" must each be one of the job's technologies
+    search, search_techs = build_search_query(q) if q else ("", [])
+    if search:
+        where_clauses.append("MATCH(title, description_text) AGAINST (%s IN BOOLEAN MODE)")
+        values.append(search)
+    for tech in search_techs:
+        where_clauses.append("id IN (SELECT job_id FROM job_technologies WHERE technology = %s)")
+        values.append(tech)
 
-    conn = get_connection()
-    cursor = conn.cursor(dictionary=True)
+    signature = filter_signature({
+        **filters,
+        "salary_min": salary_min,
+        "salary_max": salary_max,
+        "min_experience": min_experience,
+        "technologies": techs,
+        "tech_match": tech_match if techs else None,
+        "q": search,
+        "q_technologies": search_techs,
+    })
+
+    return where_clauses, values, search, signature
+
+def build_jobs_page_query(fields, where_clauses, values, search, cursor, limit, offset):
+    """SELECT for one /jobs page (limit + 1 rows, the extra one tells us there is a next page)."""
+    columns = ", ".join(LIST_COLUMNS[field] for field in fields)
+
+    # Search results are ranked by relevance
+    select_sql = columns
+    order_sql = "last_seen DESC, id DESC"
+    select_values = []
+    if search:
+        select_sql = f"{columns}, MATCH(title, description_text) AGAINST (%s IN BOOLEAN MODE) AS relevance"
+        select_values = [search]
+        order_sql = f"relevance DESC, {order_sql}"
+
+    # Keyset pagination: seek past the (last_seen, id) of the previous page's
+    # last row instead of scanning and discarding `offset` rows
+    page_clauses, page_values = list(where_clauses), list(values)
+    if cursor:
+        last_seen, last_id = decode_cursor(cursor)
+        page_clauses.append("(last_seen < %s OR (last_seen = %s AND id < %s))")
+        page_values.extend([last_seen, last_seen, last_id])
+        offset = 0
 
-    # Query for paginated results
     query = f"""
-        SELECT * FROM jobs
-        WHERE {where_sql}
-        ORDER BY last_seen DESC
+        SELECT {select_sql} FROM jobs
+        WHERE {" AND ".join(page_clauses)}
+        ORDER BY {order_sql}
         LIMIT %s OFFSET %s
     """
-    cursor.execute(query, values + [limit, offset])
-    rows = cursor.fetchall()
+    return query, select_values + page_values + [limit + 1, offset]
 
-    # Query for total count of matching rows (no pagination)
-    count_query = f"SELECT COUNT(*) as total FROM jobs WHERE {where_sql}"
-    cursor.execute(count_query, values)
-    total = cursor.fetchone()["total"]
+def get_jobs(offset=0, limit=20, cursor=None, count="exact", fields=None, **filters):
+    # id and last_seen are always selected, pagination needs them
+    fields = [field for field in LIST_COLUMNS if not fields or field in fields or field in ("id", "last_seen")]
 
-    # Decode technologies JSON
-    for row in rows:
-        try:
-            row["technologies"] = json.loads(row["technologies"])
-        except Exception:
-            row["technologies"] = []
+    # Everything but full-text search can be answered from the snapshot
+    index = None if filters.get("q") else job_snapshot.current()
+    if index is not None:
+        return get_jobs_from_snapshot(index, offset, limit, cursor, count, fields, filters)
 
-    cursor.close()
-    conn.close()
+    where_clauses, values, search, signature = build_job_filters(**filters)
+    query, query_values = build_jobs_page_query(fields, where_clauses, values, search, cursor, limit, offset)
+    where_sql = " AND ".join(where_clauses)
+
+    with get_connection() as conn:
+        db_cursor = conn.cursor(dictionary=True)
+        db_cursor.execute(query, query_values)
+        rows = db_cursor.fetchall()
+        db_cursor.close()
+
+        total, total_is_estimate = count_jobs(conn, where_sql, values, signature, count)
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    # Relevance order has no stable (last_seen, id) seek key, search results page by offset.
+    # Goes by q, not `search`: "c++" alone has no MATCH term, but the route rejects cursor + q.
+    next_cursor = encode_cursor(rows[-1]["last_seen"], rows[-1]["id"]) if has_more and not filters.get("q") else None
+
+    with timed("postprocess"):
+        for row in rows:
+            row.pop("relevance", None)
+            normalize_row(row)
 
     return {
         "data": rows,
         "total": total,
-        "page": (offset // limit) + 1,
+        "total_is_estimate": total_is_estimate,
+        "page": None if cursor else (offset // limit) + 1,
         "page_size": limit,
+        "next_cursor": next_cursor,
     }
 
-def get_job_by_id(job_id: int):
-    conn = get_connection()
-    cursor = conn.cursor(dictionary=True)
+def get_jobs_from_snapshot(index, offset, limit, cursor, count, fields, filters):
+    """get_jobs over the in-memory JobIndex. Same response shape, totals are always exact."""
+    cursor_key = None
+    if cursor:
+        last_seen, last_id = decode_cursor(cursor)
+        cursor_key = (last_seen.replace(tzinfo=None), last_id)
+
+    with timed("snapshot"):
+        bits = index.match(**filters)
+        rows, has_more = index.page(bits, offset, limit, cursor_key)
+        # Copies, the snapshot's rows are shared between requests
+        rows = [{field: row[field] for field in fields} for row in rows]
+    next_cursor = encode_cursor(rows[-1]["last_seen"], rows[-1]["id"]) if has_more else None
+
+    return {
+        "data": rows,
+        "total": None if count == "none" else bits.bit_count(),
+        "total_is_estimate": False,
+        "page": None if cursor else (offset // limit) + 1,
+        "page_size": limit,
+        "next_cursor": next_cursor,
+    }
+
+def count_jobs(conn, where_sql: str, values: list, signature: str, mode: str = "exact"):
+    """
+    Total matching rows for a listing. Returns (total, is_estimate).
+
+    exact:    COUNT(*), cached per filter signature until the data generation changes
+    estimate: last cached total (even if stale), else the optimizer's EXPLAIN row estimate
+    none:     skip counting entirely (infinite scroll)
+    """
+    if mode == "none":
+        return None, False
 
-    cursor.execute("SELECT * FROM jobs WHERE id = %s", (job_id,))
-    row = cursor.fetchone()
+    if mode == "estimate":
+        cached = count_cache.get_any(signature)
+        if cached is not None:
+            return cached, True
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(f"EXPLAIN SELECT id FROM jobs WHERE {where_sql}", values)
+        plan = cursor.fetchall()
+        cursor.close()
+        if not plan:
+            return 0, True
+        rows = plan[0].get("rows") or 0
+        filtered = plan[0].get("filtered") or 100
+        return int(rows * float(filtered) / 100), True
 
+    generation = get_data_generation(conn)
+    cached = count_cache.get(signature, generation)
+    if cached is not None:
+        return cached, False
+
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute(f"SELECT COUNT(*) as total FROM jobs WHERE {where_sql}", values)
+    total = cursor.fetchone()["total"]
     cursor.close()
-    conn.close()
+
+    count_cache.set(signature, generation, total)
+    return total, False
+
+def get_job_by_id(job_id: int):
+    with get_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(f"SELECT {', '.join(JOB_COLUMNS.values())} FROM jobs WHERE id = %s", (job_id,))
+        row = cursor.fetchone()
+        if row is None:
+            # Archived long enough ago to have been moved out of the hot table
+            cursor.execute(f"SELECT {', '.join(ARCHIVE_JOB_COLUMNS.values())} FROM jobs_archive WHERE id = %s", (job_id,))
+            row = cursor.fetchone()
+        cursor.close()
 
     if row:
-        try:
-            row["technologies"] = json.loads(row["technologies"])
-        except Exception:
-            row["technologies"] = []
+        with timed("postprocess"):
+            if row["description_html"] is not None:
+                row["description_html"] = zlib.decompress(row["description_html"]).decode("utf-8")
+            normalize_row(row)
         return row
     return None
+
+
+def build_history_query(fields, companies, cursor, limit):
+    """
+    SELECT for one page of archived postings, newest first: the ones still in
+    jobs (archived, not yet moved) plus jobs_archive. Each branch reads at most
+    a page from its (…, last_seen, id) index before the merge.
+    """
+    branches, values = [], []
+    for table, columns, base_clauses in (
+        ("jobs", LIST_COLUMNS, ["archived = TRUE"]),
+        ("jobs_archive", ARCHIVE_LIST_COLUMNS, []),
+    ):
+        clauses = list(base_clauses)
+        if companies:
+            clause, ids = dictionary_filter("company", companies)
+            clauses.append(clause)
+            values.extend(ids)
+        if cursor:
+            last_seen, last_id = decode_cursor(cursor)
+            clauses.append("(last_seen < %s OR (last_seen = %s AND id < %s))")
+            values.extend([last_seen, last_seen, last_id])
+        where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        select_sql = ", ".join(columns[field] for field in fields)
+        branches.append(f"(SELECT {select_sql} FROM {table} {where_sql} ORDER BY last_seen DESC, id DESC LIMIT %s)")
+        values.append(limit + 1)
+
+    query = f"{' UNION ALL '.join(branches)} ORDER BY last_seen DESC, id DESC LIMIT %s"
+    return query, values + [limit + 1]
+
+def get_job_history(limit=20, cursor=None, company=None):
+    """Archived postings, newest first, keyset paginated like /jobs."""
+    fields = list(LIST_COLUMNS)
+    query, values = build_history_query(fields, company, cursor, limit)
+    with get_connection() as conn:
+        db_cursor = conn.cursor(dictionary=True)
+        db_cursor.execute(query, values)
+        rows = db_cursor.fetchall()
+        db_cursor.close()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    with timed("postprocess"):
+        for row in rows:
+            normalize_row(row)
+
+    return {
+        "data": rows,
+        "total": None,
+        "page": None,
+        "page_size": limit,
+        "next_cursor": encode_cursor(rows[-1]["last_seen"], rows[-1]["id"]) if has_more else None,
+    }
+
+
+def get_active_companies():
+    index = job_snapshot.current()
+    if index is not None:
+        with timed("snapshot"):
+            return index.companies()
+
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT name FROM companies
+            WHERE id IN (SELECT company_id FROM jobs WHERE archived = FALSE)
+            ORDER BY name ASC
+        """)
+        companies = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+    return companies
+
+def facet_filters_for(filters: dict, param: str) -> dict:
+    """Filters a facet is counted under: all of them except its own."""
+    facet_filters = {**filters, param: None}
+    if param == "department":
+        facet_filters["is_swe"] = None
+    return facet_filters
+
+def build_facet_query(filters: dict):
+    """One grouped UNION ALL over all FACETS, rows are (facet, value, count)."""
+    parts, values = [], []
+    for facet, (column, param) in FACETS.items():
+        where_clauses, where_values, _, _ = build_job_filters(**facet_filters_for(filters, param))
+        # Dictionary-encoded facets group on the small id and look the name up once per group
+        value_sql, group_sql = column, column
+        if column in DICTIONARIES:
+            value_sql, group_sql = dictionary_value(column), DICTIONARIES[column][1]
+        parts.append(f"""
+            SELECT %s AS facet, {value_sql} AS value, COUNT(*) AS count
+            FROM jobs
+            WHERE {" AND ".join(where_clauses)}
+            GROUP BY {group_sql}
+        """)
+        values.append(facet)
+        values.extend(where_values)
+    return " UNION ALL ".join(parts), values
+
+def get_facet_counts(**filters):
+    """
+    Per-value job counts for each facet in FACETS, as {facet: [(value, count), ...]}.
+
+    With no filters these are counts over all active jobs. With filters, each
+    facet is counted under every applied filter except its own, so selecting
+    "remote" still shows how many hybrid/on-site jobs the other filters match.
+    Answered from the job snapshot when it is enabled; otherwise all facets
+    are computed in one grouped UNION ALL query and cached per filter
+    signature until the data generation changes.
+    """
+    index = None if filters.get("q") else job_snapshot.current()
+    if index is not None:
+        facets = {}
+        with timed("snapshot"):
+            for facet, (column, param) in FACETS.items():
+                bits = index.match(**facet_filters_for(filters, param))
+                facets[facet] = index.facet_counts(column, bits)
+        return facets
+
+    # Resolves dictionary names before the connection below is checked out
+    _, _, _, signature = build_job_filters(**filters)
+
+    with get_connection() as conn:
+        generation = get_data_generation(conn)
+        cached = facet_cache.get(signature, generation)
+        if cached is not None:
+            return cached
+
+        query, values = build_facet_query(filters)
+        cursor = conn.cursor()
+        cursor.execute(query, values)
+        rows = cursor.fetchall()
+        cursor.close()
+
+    facets = {facet: [] for facet in FACETS}
+    for facet, value, count in rows:
+        if value:
+            facets[facet].append((value, count))
+
+    facet_cache.set(signature, generation, facets)
+    return facets
+
+def insert_page_views(rows: list):
+    """Multi-row insert of (hashed_ip, path, user_agent) tuples."""
+    if not rows:
+        return
+    placeholders = ", ".join(["(%s, %s, %s)"] * len(rows))
+    values = [value for row in rows for value in row]
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"INSERT INTO page_analytics (hashed_ip, path, user_agent) VALUES {placeholders}", values)
+        conn.commit()
+        cursor.close()
+
+
+# Async variants for the routes: same queries, run on the DB thread pool
+
+async def get_jobs_async(**kwargs):
+    return await run_in_db_thread(get_jobs, **kwargs)
+
+async def get_job_by_id_async(job_id):
+    return await run_in_db_thread(get_job_by_id, job_id)
+
+async def get_job_history_async(**kwargs):
+    return await run_in_db_thread(get_job_history, **kwargs)
+
+async def get_active_companies_async():
+    return await run_in_db_thread(get_active_companies)
+
+async def get_facet_counts_async(**filters):
+    return await run_in_db_thread(get_facet_counts, **filters)
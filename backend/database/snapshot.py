@@ -0,0 +1,350 @@
+# snapshot.py
+"""
+In-process snapshot of the active job set for the read API.
+
+Active jobs are a few thousand rows, so /jobs listings, /companies and
+/filters facet counts can be answered from memory instead of MySQL. Jobs are
+kept in (last_seen DESC, id DESC) order and every low-cardinality filter
+value maps to a bitset (a Python int, bit i = i-th job in that order). A
+filter is an AND of ORs of bitsets, a count is a popcount, and a page is the
+first set bits. Near-unique fields (title, location) keep a list of positions
+per value instead, turned into a bitset only when filtered on: a bitset per
+value there would cost O(jobs²) bits.
+
+Refreshes are incremental: when the crawler bumps the data generation, only
+rows with last_seen at or past the watermark are fetched (inserts, re-seen
+jobs and archivals all touch last_seen) and the index is rebuilt from the
+merged rows. A full reload every SNAPSHOT_FULL_REFRESH seconds picks up
+anything a watermark can't see, like deleted rows.
+
+Full-text search (`q`) still goes to MySQL. String filters compare
+case-insensitively, like the ci collation the SQL path uses.
+"""
+import os
+import json
+import time
+import bisect
+import threading
+from datetime import datetime, timedelta
+from typing import get_args
+
+from database.connection import get_connection
+from database.cache import get_data_generation
+from models.job import WorkModel, Seniority
+
+SNAPSHOT_ENABLED = os.getenv("SNAPSHOT_ENABLED", "true").lower() in ("1", "true", "yes")
+FULL_REFRESH = float(os.getenv("SNAPSHOT_FULL_REFRESH", "3600"))
+WATERMARK_SLACK = timedelta(seconds=float(os.getenv("SNAPSHOT_WATERMARK_SLACK", "60")))
+# Bitsets built on demand (numeric ranges, title/location values) kept per index
+BITS_CACHE_SIZE = 256
+
+# /jobs filter param -> row field, for filters answered from a bitset index
+INDEXED_FILTERS = {
+    "company": "company",
+    "job_type": "job_type",
+    "department": "department",
+    "industry": "industry",
+    "work_model": "work_model",
+    "seniority": "seniority",
+}
+
+# Same, for high-cardinality fields indexed as value -> positions
+POSITION_FILTERS = {
+    "title": "title",
+    "location": "location",
+}
+
+# Numeric filters: param -> (field, minimum?)
+RANGE_FILTERS = {
+    "salary_min": ("salary_min", True),
+    "salary_max": ("salary_max", False),
+    "min_experience": ("min_experience", True),
+}
+
+
+# Constrained fields -> the values the response models accept
+ENUM_FIELDS = {
+    "work_model": set(get_args(WorkModel)),
+    "seniority": set(get_args(Seniority)),
+}
+
+
+def fold(value):
+    return value.casefold() if isinstance(value, str) else value
+
+
+def decode_technologies(value) -> list:
+    """technologies JSON as a list of strings, [] if it is missing or malformed."""
+    try:
+        value = json.loads(value) if isinstance(value, (str, bytes)) else value
+    except Exception:
+        return []
+    return [str(tech) for tech in value if tech is not None] if isinstance(value, list) else []
+
+
+def normalize_row(row: dict) -> dict:
+    """
+    Coerce the fields the Job / JobSummary models constrain, in place. Rows
+    are encoded without model validation, so values the models would reject
+    (a work_model outside WorkModel, undecodable technologies) become None / [].
+    """
+    if "technologies" in row:
+        row["technologies"] = decode_technologies(row["technologies"])
+    for field, allowed in ENUM_FIELDS.items():
+        value = row.get(field)
+        if value is not None:
+            value = str(value).strip().lower()
+            row[field] = value if value in allowed else None
+    return row
+
+
+class JobIndex:
+    """Immutable, sorted view of the active jobs with per-field bitset indexes."""
+
+    def __init__(self, rows: list, generation: int):
+        self.generation = generation
+        self.rows = sorted(rows, key=lambda row: (row["last_seen"] or datetime.min, row["id"]), reverse=True)
+        self.all = (1 << len(self.rows)) - 1
+        # Ascending seek keys, for cursor pagination
+        self.keys = [(row["last_seen"] or datetime.min, row["id"]) for row in reversed(self.rows)]
+
+        self.labels = {field: {} for field in INDEXED_FILTERS.values()}
+        self.positions = {field: {} for field in POSITION_FILTERS.values()}
+        self._bits_cache = {}
+
+        # Collect positions first and build each bitset once: OR-ing in one bit
+        # per row would copy an ever larger int for every row
+        indexed = {field: {} for field in INDEXED_FILTERS.values()}
+        technologies = {}
+        winnipeg = []
+        for position, row in enumerate(self.rows):
+            for field, values in indexed.items():
+                value = row.get(field)
+                if value is None:
+                    continue
+                key = fold(value)
+                values.setdefault(key, []).append(position)
+                self.labels[field].setdefault(key, value)
+            for field, values in self.positions.items():
+                value = row.get(field)
+                if value is not None:
+                    values.setdefault(fold(value), []).append(position)
+            for tech in {str(tech).strip().lower() for tech in row.get("technologies") or [] if str(tech).strip()}:
+                technologies.setdefault(tech, []).append(position)
+            if row.get("is_winnipeg"):
+                winnipeg.append(position)
+
+        self.bitsets = {field: {key: self.bits(positions) for key, positions in values.items()}
+                        for field, values in indexed.items()}
+        self.technologies = {tech: self.bits(positions) for tech, positions in technologies.items()}
+        self.winnipeg = self.bits(winnipeg)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def bits(self, positions) -> int:
+        """Bitset with `positions` set, built in one pass over a byte buffer."""
+        buffer = bytearray((len(self.rows) + 7) // 8)
+        for position in positions:
+            buffer[position >> 3] |= 1 << (position & 7)
+        return int.from_bytes(buffer, "little")
+
+    def _cached_bits(self, key: tuple, positions) -> int:
+        """bits(positions()) memoized under `key`; positions is only called on a miss."""
+        bits = self._bits_cache.get(key)
+        if bits is None:
+            bits = self.bits(positions())
+            if len(self._bits_cache) >= BITS_CACHE_SIZE:
+                self._bits_cache.clear()
+            self._bits_cache[key] = bits
+        return bits
+
+    def _range(self, field: str, minimum: bool, bound) -> int:
+        return self._cached_bits(("range", field, minimum, bound), lambda: (
+            position for position, row in enumerate(self.rows)
+            if row.get(field) is not None and (row[field] >= bound if minimum else row[field] <= bound)
+        ))
+
+    def match(self, tech_match="all", technologies=None, is_winnipeg=None, is_swe=None, **filters) -> int:
+        """Bitset of jobs matching the /jobs filters (everything but `q`)."""
+        bits = self.all
+
+        for param, field in INDEXED_FILTERS.items():
+            values = filters.get(param)
+            if not values:
+                continue
+            if not isinstance(values, list):
+                values = [values]
+            bitsets = self.bitsets[field]
+            allowed = 0
+            for value in values:
+                allowed |= bitsets.get(fold(value), 0)
+            bits &= allowed
+
+        for param, field in POSITION_FILTERS.items():
+            values = filters.get(param)
+            if not values:
+                continue
+            if not isinstance(values, list):
+                values = [values]
+            keys = tuple(sorted({fold(value) for value in values}))
+            positions = self.positions[field]
+            bits &= self._cached_bits((field, keys), lambda: (
+                position for key in keys for position in positions.get(key, ())
+            ))
+
+        if is_swe:
+            bits &= self.bitsets["department"].get("software_engineering", 0)
+        if is_winnipeg is not None:
+            bits &= self.winnipeg if is_winnipeg else self.all & ~self.winnipeg
+
+        for param, (field, minimum) in RANGE_FILTERS.items():
+            if filters.get(param) is not None:
+                bits &= self._range(field, minimum, filters[param])
+
+        techs = sorted({tech.strip().lower() for tech in technologies or [] if tech.strip()})
+        if techs:
+            tech_bits = [self.technologies.get(tech, 0) for tech in techs]
+            if tech_match == "any":
+                combined = 0
+                for tech_bit in tech_bits:
+                    combined |= tech_bit
+            else:
+                combined = self.all
+                for tech_bit in tech_bits:
+                    combined &= tech_bit
+            bits &= combined
+
+        return bits
+
+    def page(self, bits: int, offset: int, limit: int, cursor_key=None):
+        """Rows for one page of `bits` in listing order, plus whether more follow."""
+        if cursor_key is not None:
+            # Keep only jobs strictly after the cursor in (last_seen, id) DESC order
+            start = len(self.rows) - bisect.bisect_left(self.keys, cursor_key)
+            bits &= ~((1 << start) - 1)
+            offset = 0
+
+        rows = []
+        skipped = 0
+        while bits and len(rows) <= limit:
+            low = bits & -bits
+            bits ^= low
+            if skipped < offset:
+                skipped += 1
+                continue
+            rows.append(self.rows[low.bit_length() - 1])
+        return rows[:limit], len(rows) > limit
+
+    def facet_counts(self, column: str, bits: int) -> list:
+        labels = self.labels[column]
+        counts = []
+        for key, value_bits in self.bitsets[column].items():
+            count = (bits & value_bits).bit_count()
+            if count and labels[key]:
+                counts.append((labels[key], count))
+        return counts
+
+    def companies(self) -> list:
+        return sorted(self.labels["company"].values(), key=str.casefold)
+
+
+class JobSnapshot:
+    """
+    Keeps a JobIndex current with the data generation. `current()` returns
+    None when the snapshot is disabled, so callers fall back to SQL.
+    """
+
+    def __init__(self, columns: dict, enabled: bool = SNAPSHOT_ENABLED, full_refresh: float = FULL_REFRESH):
+        self.columns = columns
+        self.enabled = enabled
+        self.full_refresh = full_refresh
+
+        self.index = None
+        self._rows = {}  # id -> row, active jobs only
+        self._watermark = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+        self.full_loads = 0
+        self.incremental_loads = 0
+        self.last_refresh_ms = 0.0
+
+    def _fetch(self, conn, where_sql: str, values: list) -> list:
+        cursor = conn.cursor(dictionary=True)
+        select_sql = ", ".join(self.columns.values())
+        cursor.execute(f"SELECT {select_sql} FROM jobs WHERE {where_sql}", values)
+        rows = cursor.fetchall()
+        cursor.close()
+        for row in rows:
+            normalize_row(row)
+        return rows
+
+    def refresh(self, generation: int, full: bool = False):
+        started = time.perf_counter()
+        full = full or self._watermark is None
+        with get_connection() as conn:
+            if full:
+                fetched = self._fetch(conn, "archived = FALSE", [])
+                rows = {row["id"]: row for row in fetched}
+                watermark = None
+                self._loaded_at = time.monotonic()
+                self.full_loads += 1
+            else:
+                # Look back a little past the watermark: a row stamped by a
+                # transaction that committed after our last read can carry an
+                # older last_seen
+                fetched = self._fetch(conn, "last_seen >= %s", [self._watermark - WATERMARK_SLACK])
+                rows = dict(self._rows)
+                for row in fetched:
+                    if row["archived"]:
+                        rows.pop(row["id"], None)
+                    else:
+                        rows[row["id"]] = row
+                watermark = self._watermark
+                self.incremental_loads += 1
+
+        for row in fetched:
+            if row["last_seen"] and (watermark is None or row["last_seen"] > watermark):
+                watermark = row["last_seen"]
+
+        self._watermark = watermark
+        self._rows = rows
+        self.index = JobIndex(list(rows.values()), generation)
+        self.last_refresh_ms = (time.perf_counter() - started) * 1000
+        print(f"🔄 Job snapshot {'full' if full else 'incremental'} refresh: "
+              f"{len(fetched)} rows fetched, {len(rows)} active jobs in {self.last_refresh_ms:.1f}ms")
+
+    def current(self):
+        if not self.enabled:
+            return None
+
+        generation = get_data_generation()
+        index = self.index
+        stale_full = time.monotonic() - self._loaded_at > self.full_refresh
+        if index is not None and index.generation == generation and not stale_full:
+            return index
+
+        # One thread refreshes, the others keep serving the previous snapshot
+        if not self._lock.acquire(blocking=index is None):
+            return index
+        try:
+            index = self.index
+            stale_full = time.monotonic() - self._loaded_at > self.full_refresh
+            if index is None or index.generation != generation or stale_full:
+                self.refresh(generation, full=index is None or stale_full)
+            return self.index
+        finally:
+            self._lock.release()
+
+    def stats(self) -> dict:
+        index = self.index
+        return {
+            "enabled": self.enabled,
+            "jobs": len(index) if index else 0,
+            "generation": index.generation if index else None,
+            "watermark": self._watermark.isoformat() if self._watermark else None,
+            "full_loads": self.full_loads,
+            "incremental_loads": self.incremental_loads,
+            "last_refresh_ms": round(self.last_refresh_ms, 2),
+        }
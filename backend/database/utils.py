@@ -1,7 +1,15 @@
 import re
-from typing import Any, Dict, List
+import json
+import base64
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
 
 DANGEROUS_SQL_PATTERN = re.compile(r"(;|--|\b(drop|select|insert|update|delete|alter|create)\b)", re.IGNORECASE)
+# + # . stay inside a term so "c++", "c#", "node.js" and ".net" survive whole,
+# the same way job_technologies stores them
+SEARCH_TERM_PATTERN = re.compile(r"\.?\w[\w+#.]*", re.UNICODE)
+SEARCH_SYMBOLS = set("+#.")
+MAX_SEARCH_TERMS = 8
 
 def sanitize_filters(params: Dict[str, Any], strict_sql: bool = False) -> Dict[str, Any]:
     sanitized = {}
@@ -32,3 +40,49 @@ def sanitize_filters(params: Dict[str, Any], strict_sql: bool = False) -> Dict[s
             sanitized[key] = value
 
     return sanitized
+
+
+def encode_cursor(last_seen: datetime, job_id: str) -> str:
+    """Opaque keyset cursor for the (last_seen, id) position of a row."""
+    payload = json.dumps([last_seen.isoformat(), job_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of `encode_cursor`. Raises ValueError on malformed input."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_seen, job_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(last_seen), str(job_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def filter_signature(filters: Dict[str, Any]) -> str:
+    """Order-insensitive key for a set of filters, used to cache per-filter results."""
+    normalized = {}
+    for key, value in filters.items():
+        if value is None or value == []:
+            continue
+        if isinstance(value, list):
+            value = sorted(set(str(item) for item in value))
+        normalized[key] = value
+    return json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+
+
+def build_search_query(q: str) -> Tuple[str, List[str]]:
+    """
+    Split free text into a MySQL BOOLEAN MODE expression where every word is
+    required and prefix-matched ("backend python" -> "+backend* +python*"),
+    and the terms containing + # or . ("c++", "node.js"). The full-text parser
+    splits those apart, so they are returned lower-cased for an exact
+    job_technologies lookup instead. Returns ("", []) if there are no terms.
+    """
+    words, symbols = [], []
+    for term in SEARCH_TERM_PATTERN.findall(q or "")[:MAX_SEARCH_TERMS]:
+        term = term.rstrip(".")
+        if SEARCH_SYMBOLS.intersection(term):
+            symbols.append(term.lower())
+        else:
+            words.append(term)
+    return " ".join(f"+{word}*" for word in words), sorted(set(symbols))
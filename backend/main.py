@@ -6,9 +6,16 @@ from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from utils.limiter import limiter
-from routes import jobs, companies, filters, analytics
+from utils.response_cache import ResponseCacheMiddleware
+from utils.json_response import FastJSONResponse
+from utils.metrics import METRICS_ENABLED, TimingMiddleware
+from database.connection import pool, db_executor, run_in_db_thread, PoolTimeout
+from database.queries import job_snapshot
+from database.analytics_buffer import page_view_buffer
+from routes import jobs, companies, filters, analytics, health, metrics
 
-app = FastAPI(title="Job API")
+app = FastAPI(title="Job API", default_response_class=FastJSONResponse)
+app.add_middleware(ResponseCacheMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # frontend
@@ -18,12 +25,40 @@ app.add_middleware(
 )
 app.state.limiter = limiter
 app.add_middleware(SlowAPIMiddleware)
+if METRICS_ENABLED:
+    # Added last so it is outermost and also times cache hits and rate-limited requests
+    app.add_middleware(TimingMiddleware)
 
 @app.exception_handler(RateLimitExceeded)
 async def rate_limit_handler(request, exc):
     return JSONResponse(status_code=429, content={"detail": "Rate limit exceeded"})
 
+@app.exception_handler(PoolTimeout)
+async def pool_timeout_handler(request, exc):
+    return JSONResponse(status_code=503, content={"detail": "Database busy, try again"})
+
+@app.on_event("startup")
+async def start_analytics_buffer():
+    page_view_buffer.start()
+
+@app.on_event("startup")
+async def warm_job_snapshot():
+    # Load active jobs before the first request; if this fails the first request retries
+    try:
+        await run_in_db_thread(job_snapshot.current)
+    except Exception as e:
+        print(f"⚠️ Job snapshot not loaded at startup: {e}")
+
+@app.on_event("shutdown")
+async def close_db_pool():
+    # Flush queued page views while the pool is still open
+    await page_view_buffer.stop()
+    db_executor.shutdown(wait=True)
+    pool.close()
+
 app.include_router(jobs.router)
 app.include_router(companies.router)
 app.include_router(filters.router)
-app.include_router(analytics.router)
\ No newline at end of file
+app.include_router(analytics.router)
+app.include_router(health.router)
+app.include_router(metrics.router)
\ No newline at end of file
@@ -2,6 +2,9 @@ from pydantic import BaseModel
 from typing import Optional, List, Literal
 from datetime import datetime
 
+WorkModel = Literal["remote", "on-site", "hybrid"]
+Seniority = Literal["entry", "mid", "senior", "lead"]
+
 class Job(BaseModel):
     id: str
     company: str
@@ -12,9 +15,9 @@ class Job(BaseModel):
     link: str
     salary_min: Optional[int]
     salary_max: Optional[int]
-    work_model: Optional[Literal["remote", "on-site", "hybrid"]]
+    work_model: Optional[WorkModel]
     industry: Optional[str]
-    seniority: Optional[Literal["entry", "mid", "senior", "lead"]]
+    seniority: Optional[Seniority]
     technologies: List[str]
     is_winnipeg: int
     department: Optional[str]
@@ -22,3 +25,26 @@ class Job(BaseModel):
     archived: int
     last_seen: Optional[datetime]
     date_added: Optional[datetime]
+
+
+class JobSummary(BaseModel):
+    """List view of a job. Every field is optional so `fields=` projections validate."""
+    id: str
+    company: Optional[str] = None
+    title: Optional[str] = None
+    location: Optional[str] = None
+    job_type: Optional[str] = None
+    description_snippet: Optional[str] = None
+    link: Optional[str] = None
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+    work_model: Optional[WorkModel] = None
+    industry: Optional[str] = None
+    seniority: Optional[Seniority] = None
+    technologies: Optional[List[str]] = None
+    is_winnipeg: Optional[int] = None
+    department: Optional[str] = None
+    min_experience: Optional[int] = None
+    archived: Optional[int] = None
+    last_seen: Optional[datetime] = None
+    date_added: Optional[datetime] = None
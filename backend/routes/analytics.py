@@ -1,14 +1,21 @@
 # analytics.py
-from fastapi import APIRouter, Request
+import os
+from fastapi import APIRouter, Request, HTTPException
 from hashlib import sha256
-from database.connection import get_connection
+from utils.limiter import limiter
+from database.analytics_buffer import page_view_buffer, BufferFull
+from utils.metrics import TimedRoute
 
-router = APIRouter()
+MAX_BATCH_EVENTS = int(os.getenv("ANALYTICS_MAX_BATCH_EVENTS", "50"))
+
+router = APIRouter(route_class=TimedRoute)
 
 @router.post("/analytics")
 async def log_analytics(request: Request):
     data = await request.json()
     path = data.get("path")
+    if not isinstance(path, str) or not path:
+        raise HTTPException(status_code=422, detail="path is required")
 
     # Extract IP & User Agent
     ip = request.client.host
@@ -17,14 +24,46 @@ async def log_analytics(request: Request):
     # Hash IP to preserve privacy
     hashed_ip = sha256(ip.encode()).hexdigest()
 
-    # Insert into DB
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO page_analytics (hashed_ip, path, user_agent)
-        VALUES (%s, %s, %s)
-    """, (hashed_ip, path, user_agent))
-    conn.commit()
-    conn.close()
+    # Queue for the next batched insert, one bad row must not sink a whole batch
+    try:
+        await page_view_buffer.add((hashed_ip, path[:255], user_agent))
+    except BufferFull:
+        raise HTTPException(status_code=503, detail="Analytics busy, try again")
 
     return {"status": "ok"}
+
+
+@router.post("/analytics/batch")
+@limiter.limit("30/minute")
+async def log_analytics_batch(request: Request):
+    """
+    Several page views in one request, e.g. flushed with navigator.sendBeacon
+    on page hide. Body is a JSON array of events or {"events": [...]}, each
+    event being {"path": "..."}. The whole batch is validated before any of it
+    is queued and counts once against the rate limit.
+    """
+    try:
+        data = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON")
+
+    events = data.get("events") if isinstance(data, dict) else data
+    if not isinstance(events, list) or not events:
+        raise HTTPException(status_code=422, detail="events must be a non-empty array")
+    if len(events) > MAX_BATCH_EVENTS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_EVENTS} events per batch")
+
+    paths = [event.get("path") if isinstance(event, dict) else None for event in events]
+    if not all(isinstance(path, str) and path for path in paths):
+        raise HTTPException(status_code=422, detail="Every event needs a path")
+
+    # One hash per batch, every event comes from the same client
+    hashed_ip = sha256(request.client.host.encode()).hexdigest()
+    user_agent = request.headers.get("user-agent", "unknown")
+
+    try:
+        await page_view_buffer.add_many([(hashed_ip, path[:255], user_agent) for path in paths])
+    except BufferFull:
+        raise HTTPException(status_code=503, detail="Analytics busy, try again")
+
+    return {"status": "ok", "accepted": len(paths)}
@@ -1,14 +1,9 @@
 from fastapi import APIRouter
-from database.connection import get_connection
+from database.queries import get_active_companies_async
+from utils.metrics import TimedRoute
 
-router = APIRouter(prefix="/companies", tags=["Companies"])
+router = APIRouter(prefix="/companies", tags=["Companies"], route_class=TimedRoute)
 
 @router.get("/", response_model=list[str])
-def list_companies():
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT DISTINCT company FROM jobs WHERE archived = FALSE ORDER BY company ASC")
-    companies = [row[0] for row in cursor.fetchall()]
-    cursor.close()
-    conn.close()
-    return companies
+async def list_companies():
+    return await get_active_companies_async()
@@ -1,38 +1,76 @@
 # routes/filters.py
 
-from fastapi import APIRouter
-from database.connection import get_connection
+from fastapi import APIRouter, Query
+from typing import List, Optional, Literal
+from database.queries import get_facet_counts_async
+from database.utils import sanitize_filters
+from utils.metrics import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
-@router.get("/filters")
-def get_filter_options():
-    conn = get_connection()
-    cursor = conn.cursor(dictionary=True)
-
-    cursor.execute("""
-        SELECT seniority, job_type, work_model, department, industry
-        FROM jobs
-        WHERE archived = FALSE
-    """)
-    rows = cursor.fetchall()
-
-    def count_options(field, normalize=lambda x: x):
-        values = [normalize(row[field]) for row in rows if row[field]]
-        unique = set(values)
-        return [
+def count_options(counts, normalize=lambda x: x):
+    merged = {}
+    for value, count in counts:
+        value = normalize(value)
+        merged[value] = merged.get(value, 0) + count
+    return sorted(
+        [
             {
                 "id": value,
                 "label": value.replace("-", " ").replace("_", " ").title(),
-                "count": values.count(value),
+                "count": count,
             }
-            for value in unique
-        ]
+            for value, count in merged.items()
+        ],
+        key=lambda x: -x["count"],
+    )
+
+@router.get("/filters")
+async def get_filter_options(
+    # Optional: count each facet under the filters already applied on /jobs
+    q: Optional[str] = Query(None, max_length=200),
+    company: Optional[List[str]] = Query(None),
+    title: Optional[List[str]] = Query(None),
+    location: Optional[List[str]] = Query(None),
+    job_type: Optional[List[str]] = Query(None),
+    department: Optional[List[str]] = Query(None),
+    industry: Optional[List[str]] = Query(None),
+    work_model: Optional[List[str]] = Query(None),
+    seniority: Optional[List[str]] = Query(None),
+    technologies: Optional[List[str]] = Query(None),
+    tech_match: Literal["any", "all"] = Query("all"),
+
+    is_winnipeg: Optional[bool] = Query(None),
+    is_swe: Optional[bool] = Query(None),
+
+    salary_min: Optional[float] = Query(None),
+    salary_max: Optional[float] = Query(None),
+    min_experience: Optional[float] = Query(None),
+):
+    filters = sanitize_filters({
+        "company": company,
+        "title": title,
+        "location": location,
+        "job_type": job_type,
+        "department": department,
+        "industry": industry,
+        "work_model": work_model,
+        "seniority": seniority,
+        "technologies": technologies,
+        "is_winnipeg": is_winnipeg,
+        "salary_min": salary_min,
+        "salary_max": salary_max,
+        "min_experience": min_experience,
+        "is_swe": is_swe
+    },
+        strict_sql=True
+    )
+    facets = await get_facet_counts_async(q=q, tech_match=tech_match, **filters)
 
     return {
-        "seniority": sorted(count_options("seniority", lambda x: x.lower()), key=lambda x: -x["count"]),
-        "jobTypes": sorted(count_options("job_type", lambda x: x.lower().replace(" ", "-")), key=lambda x: -x["count"]),
-        "workModels": sorted(count_options("work_model", lambda x: x.lower()), key=lambda x: -x["count"]),
-        "departments": sorted(count_options("department", lambda x: x.lower().replace(" ", "_")), key=lambda x: -x["count"]),
-        "industries": sorted(count_options("industry", lambda x: x.lower().replace(" ", "-")), key=lambda x: -x["count"]),
+        "seniority": count_options(facets["seniority"], lambda x: x.lower()),
+        "jobTypes": count_options(facets["jobTypes"], lambda x: x.lower().replace(" ", "-")),
+        "workModels": count_options(facets["workModels"], lambda x: x.lower()),
+        "departments": count_options(facets["departments"], lambda x: x.lower().replace(" ", "_")),
+        "industries": count_options(facets["industries"], lambda x: x.lower().replace(" ", "-")),
     }
@@ -0,0 +1,23 @@
+# routes/health.py
+
+from fastapi import APIRouter, Depends
+from database.connection import pool
+from database.analytics_buffer import page_view_buffer
+from database.queries import job_snapshot
+from utils.metrics import TimedRoute, require_metrics_token
+
+# Internals, same bearer token as /metrics
+router = APIRouter(prefix="/health", tags=["Health"], route_class=TimedRoute,
+                   dependencies=[Depends(require_metrics_token)], include_in_schema=False)
+
+@router.get("/db")
+def db_pool_stats():
+    return pool.stats()
+
+@router.get("/analytics")
+def analytics_buffer_stats():
+    return page_view_buffer.stats()
+
+@router.get("/snapshot")
+def job_snapshot_stats():
+    return job_snapshot.stats()
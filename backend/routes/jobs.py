@@ -1,27 +1,35 @@
 from fastapi import APIRouter, Request, Query, Path, HTTPException
 from utils.limiter import limiter
-from models.job import Job
+from models.job import Job, JobSummary
 from pydantic import BaseModel
-from database.queries import get_jobs, get_job_by_id
-from typing import List, Optional
-from database.utils import sanitize_filters
+from database.queries import get_jobs_async, get_job_by_id_async, get_job_history_async, LIST_COLUMNS
+from typing import List, Optional, Literal
+from database.utils import sanitize_filters, decode_cursor
+from utils.json_response import FastJSONResponse
+from utils.metrics import TimedRoute
 
-router = APIRouter(prefix="/jobs", tags=["Jobs"])
+router = APIRouter(prefix="/jobs", tags=["Jobs"], route_class=TimedRoute)
 
 class JobListResponse(BaseModel):
-    data: List[Job]
-    total: int
-    page: int
+    data: List[JobSummary]
+    total: Optional[int]
+    total_is_estimate: bool = False
+    page: Optional[int]
     page_size: int
+    next_cursor: Optional[str] = None
 
-@router.get("/", response_model=JobListResponse)
+@router.get("/", response_model=JobListResponse, response_model_exclude_unset=True)
 @limiter.limit("30/minute")
-def list_jobs(
+async def list_jobs(
     request: Request,
     offset: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous page; takes precedence over offset"),
+    count: Literal["exact", "estimate", "none"] = Query("exact", description="How to compute `total`"),
+    fields: Optional[str] = Query(None, description="Comma-separated JobSummary fields to return, default all"),
 
     # Filters
+    q: Optional[str] = Query(None, max_length=200, description="Full-text search over title and description"),
     company: Optional[List[str]] = Query(None),
     title: Optional[List[str]] = Query(None),
     location: Optional[List[str]] = Query(None),
@@ -31,6 +39,7 @@ def list_jobs(
     work_model: Optional[List[str]] = Query(None),
     seniority: Optional[List[str]] = Query(None),
     technologies: Optional[List[str]] = Query(None),
+    tech_match: Literal["any", "all"] = Query("all", description="Match jobs with any or all of `technologies`"),
 
     is_winnipeg: Optional[bool] = Query(None),
     is_swe: Optional[bool] = Query(None),
@@ -58,17 +67,60 @@ def list_jobs(
     },
         strict_sql=True
     )
-    return get_jobs(
+    selected_fields = None
+    if fields:
+        selected_fields = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in selected_fields if field not in LIST_COLUMNS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+    if cursor and q:
+        raise HTTPException(status_code=400, detail="Cursor pagination is not supported with q, use offset")
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # Rows come back already shaped like JobListResponse, encode them directly
+    # instead of re-validating 100 rows through the response model
+    result = await get_jobs_async(
         offset=offset,
         limit=limit,
+        cursor=cursor,
+        count=count,
+        fields=selected_fields,
+        q=q,
+        tech_match=tech_match,
         **filters
     )
+    return FastJSONResponse(result)
+
+
+@router.get("/history", response_model=JobListResponse, response_model_exclude_unset=True)
+@limiter.limit("30/minute")
+async def list_job_history(
+    request: Request,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous page"),
+    company: Optional[List[str]] = Query(None),
+):
+    """Archived postings, most recently seen first."""
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    filters = sanitize_filters({"company": company}, strict_sql=True)
+    result = await get_job_history_async(limit=limit, cursor=cursor, company=filters.get("company"))
+    return FastJSONResponse(result)
 
 
 @router.get("/{job_id}", response_model=Job)
 @limiter.limit("60/minute")
-def get_job(request: Request, job_id: str = Path(..., description="ID of the job to fetch")):
-    job = get_job_by_id(job_id)
+async def get_job(request: Request, job_id: str = Path(..., description="ID of the job to fetch")):
+    job = await get_job_by_id_async(job_id)
     if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
-    return job
\ No newline at end of file
+    return FastJSONResponse(job)
\ No newline at end of file
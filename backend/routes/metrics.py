@@ -0,0 +1,22 @@
+# routes/metrics.py
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from database.connection import pool
+from database.queries import job_snapshot
+from utils.metrics import render_metrics, require_metrics_token, TimedRoute
+
+router = APIRouter(tags=["Metrics"], route_class=TimedRoute)
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False,
+            dependencies=[Depends(require_metrics_token)])
+def metrics():
+    pool_stats = pool.stats()
+    snapshot_stats = job_snapshot.stats()
+    gauges = {
+        "applynow_db_pool_open": pool_stats["open"],
+        "applynow_db_pool_in_use": pool_stats["in_use"],
+        "applynow_db_pool_timeouts": pool_stats["timeouts"],
+        "applynow_job_snapshot_jobs": snapshot_stats["jobs"],
+    }
+    return PlainTextResponse(render_metrics(gauges), media_type="text/plain; version=0.0.4")
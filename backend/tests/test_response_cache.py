@@ -0,0 +1,72 @@
+import inspect
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from slowapi import Limiter, _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+from slowapi.util import get_remote_address
+
+import database.cache
+from utils import response_cache
+from utils.response_cache import ResponseCacheMiddleware
+
+
+def test_slowapi_keeps_the_private_limit_check():
+    # check_rate_limit calls this directly, pinned to slowapi==0.1.9
+    check = getattr(Limiter, "_check_request_limit", None)
+    assert check is not None, "slowapi no longer has Limiter._check_request_limit"
+    assert list(inspect.signature(check).parameters)[:4] == ["self", "request", "endpoint_func", "in_middleware"]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    reads = []
+
+    def read_generation(conn=None):
+        reads.append(1)
+        return 1
+
+    monkeypatch.setattr(database.cache, "read_data_generation", read_generation)
+    monkeypatch.setattr(database.cache, "get_connection", lambda: _NullConnection())
+    monkeypatch.setattr(database.cache, "_generation", {"value": None, "checked_at": 0.0})
+
+    limiter = Limiter(key_func=get_remote_address, storage_uri="memory://")
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+    app.add_middleware(ResponseCacheMiddleware)
+
+    @app.get("/jobs/")
+    @limiter.limit("3/minute")
+    async def list_jobs(request: Request):
+        return {"data": []}
+
+    with TestClient(app) as test_client:
+        test_client.generation_reads = reads
+        yield test_client
+
+
+class _NullConnection:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def test_cache_hits_and_304s_count_against_the_limit(client):
+    first = client.get("/jobs")
+    assert first.status_code == 200
+
+    # Served from the cache: a hit and a revalidation, then over the limit
+    assert client.get("/jobs").status_code == 200
+    assert client.get("/jobs", headers={"If-None-Match": first.headers["etag"]}).status_code == 304
+    assert client.get("/jobs").status_code == 429
+
+
+def test_generation_is_read_once_per_ttl(client):
+    for _ in range(3):
+        client.get("/jobs")
+    assert len(client.generation_reads) == 1
+    assert response_cache.cached_data_generation() == 1
@@ -0,0 +1,47 @@
+# json_response.py
+"""
+JSON responses for payloads that database/queries.py already shapes to the
+response model (plain dicts of str/int/None/list/datetime).
+
+Returning one of these from a route skips FastAPI's response_model pass
+(validate into models, dump back to dicts, json.dumps) and encodes the dict
+once. The bytes match what that pass produces: compact separators, UTF-8
+instead of \\u escapes, datetimes as isoformat().
+"""
+import json
+from datetime import date, datetime
+from starlette.responses import JSONResponse
+from utils.metrics import timed
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to the stdlib encoder
+    orjson = None
+
+
+def encode_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def stdlib_dumps(content) -> bytes:
+    return json.dumps(
+        content,
+        default=encode_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return stdlib_dumps(content)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        with timed("serialize"):
+            return dumps(content)
@@ -1,5 +1,17 @@
 # limiter.py
+import os
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-limiter = Limiter(key_func=get_remote_address)
+import utils.rate_limit_storage  # registers shm:// storage and the token-bucket strategy
+
+# Shared by all workers on the host by default. memory:// + fixed-window gives the old per-process behaviour.
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=os.getenv("RATELIMIT_STORAGE_URL", "shm://"),
+    strategy=os.getenv("RATELIMIT_STRATEGY", "token-bucket"),
+)
+
+# Off only for load tests (benchmarks/load_test.py). Set after construction:
+# slowapi reads RATELIMIT_ENABLED itself but keeps it as a string, so "false" would be truthy.
+limiter.enabled = os.getenv("RATELIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
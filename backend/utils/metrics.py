@@ -0,0 +1,292 @@
+# metrics.py
+"""
+Per-request phase timings, reported in a Server-Timing header and as
+Prometheus histograms on /metrics.
+
+Code under a request adds to the current request's timings with `timed(phase)`
+or `record(phase, seconds)`; outside a request both are no-ops. Phases:
+
+  db_wait      queued for a DB thread + checking out a pooled connection
+  db_query     holding the connection (queries and fetches)
+  snapshot     answering from the in-memory job snapshot
+  postprocess  reshaping rows (technologies JSON decode etc.)
+  validate     FastAPI's work around the endpoint: parameter parsing and
+               response_model validation (routes built with TimedRoute)
+  serialize    JSON encoding
+
+Metrics are per process: with several uvicorn workers each scrape sees the
+worker that answered it, so series carry a `worker` (pid) label. /metrics and
+the /health stats are only served with METRICS_TOKEN set, to callers sending
+it as a bearer token (`require_metrics_token`).
+"""
+import os
+import time
+import bisect
+import inspect
+import secrets
+import functools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from fastapi import Request, HTTPException
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.routing import Match
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+# Bearer token /metrics and /health/* require; unset, they answer 404
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+PHASES = ("db_wait", "db_query", "snapshot", "postprocess", "validate", "serialize")
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_timings = ContextVar("request_timings", default=None)
+_endpoint_marks = ContextVar("endpoint_marks", default=None)
+
+
+def record(phase: str, seconds: float):
+    timings = _timings.get()
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + seconds
+
+
+@contextmanager
+def timed(phase: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(phase, time.perf_counter() - start)
+
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names: tuple, values: tuple) -> str:
+    pairs = ",".join(f'{name}="{escape_label(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: tuple):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values: tuple, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self, extra: tuple = ()) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            lines.append(f"{self.name}{format_labels(self.labels + ('worker',), label_values + extra)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels: tuple, buckets: tuple = BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, label_values: tuple, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self, extra: tuple = ()) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        names = self.labels + ("worker",)
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        for label_values, series in items:
+            values = label_values + extra
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series):
+                cumulative += count
+                labels = format_labels(names + ("le",), values + (bound,))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(names, values)} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{format_labels(names, values)} {cumulative}")
+        return lines
+
+
+requests_total = Counter(
+    "applynow_http_requests_total", "HTTP requests by route, method and status.", ("route", "method", "status"),
+)
+request_duration = Histogram(
+    "applynow_http_request_duration_seconds", "Time from request to last response byte.", ("route", "method"),
+)
+phase_duration = Histogram(
+    "applynow_http_request_phase_seconds", "Time spent in each phase of a request.", ("route", "phase"),
+)
+
+
+def render_metrics(gauges: dict = None) -> str:
+    """Prometheus text exposition of the request metrics plus any `{name: value}` gauges."""
+    worker = (os.getpid(),)
+    lines = requests_total.render(worker) + request_duration.render(worker) + phase_duration.render(worker)
+    for name, value in (gauges or {}).items():
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name}{format_labels(('worker',), worker)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def require_metrics_token(request: Request):
+    """
+    Dependency for the operational endpoints: pool, buffer, snapshot and
+    per-route traffic are not for the public. Anything but the right bearer
+    token gets the same 404 as an unknown path.
+    """
+    supplied = request.headers.get("authorization", "").removeprefix("Bearer ").strip()
+    if not METRICS_TOKEN or not secrets.compare_digest(supplied.encode(), METRICS_TOKEN.encode()):
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+def route_label(scope) -> str:
+    """Route template (/jobs/{job_id}), not the raw path, to keep label cardinality bounded."""
+    route = scope.get("route")
+    if route is None:
+        # Served before routing, e.g. a response cache hit
+        for candidate in scope["app"].router.routes:
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", None) or "unmatched"
+
+
+def server_timing(timings: dict, total: float) -> str:
+    parts = [f"{phase};dur={timings[phase] * 1000:.2f}" for phase in PHASES if phase in timings]
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
+
+
+class TimingMiddleware:
+    """
+    Outermost ASGI middleware: collects the phase timings of each request,
+    adds them as a Server-Timing header and records the histograms. A dict and
+    a few perf_counter calls per request, cheap enough to leave on.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = {}
+        token = _timings.set(timings)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing(timings, time.perf_counter() - start))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _timings.reset(token)
+            elapsed = time.perf_counter() - start
+            route = route_label(scope)
+            method = scope["method"]
+            requests_total.inc((route, method, str(status)))
+            request_duration.observe((route, method), elapsed)
+            for phase, seconds in timings.items():
+                phase_duration.observe((route, phase), seconds)
+
+
+def _timed_endpoint(endpoint):
+    """
+    Wrap an endpoint to note when it ran, for TimedRoute. Keeps its signature
+    for FastAPI. include_router re-creates each route with the same class and
+    the already wrapped endpoint, so wrapped endpoints are marked and kept as is.
+    """
+    if getattr(endpoint, "__timed__", False):
+        return endpoint
+
+    def enter():
+        marks = _endpoint_marks.get()
+        if marks is not None:
+            marks["start"] = time.perf_counter()
+
+    def leave():
+        marks = _endpoint_marks.get()
+        if marks is not None:
+            marks["end"] = time.perf_counter()
+            timings = _timings.get() or {}
+            marks["serialize"] = timings.get("serialize", 0.0)
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            enter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                leave()
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            enter()
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                leave()
+    wrapper.__timed__ = True
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    """
+    Route class (APIRouter(route_class=TimedRoute)) that times FastAPI's own
+    work around the endpoint as `validate`: parameter parsing before it, and
+    response_model validation and encoding after it. Encoding already counted
+    as `serialize` is left out. Only public FastAPI API, and only for routes
+    that opt in; outside a timed request it adds two perf_counter calls.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            timings = _timings.get()
+            if timings is None:
+                return await handler(request)
+            # Mutated in place, so it also sees sync endpoints run in the threadpool
+            marks = {}
+            token = _endpoint_marks.set(marks)
+            start = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                end = time.perf_counter()
+                _endpoint_marks.reset(token)
+                if "end" in marks:
+                    serialized = timings.get("serialize", 0.0) - marks["serialize"]
+                    record("validate", max(0.0, (marks["start"] - start) + (end - marks["end"]) - serialized))
+
+        return timed_handler
@@ -0,0 +1,242 @@
+# rate_limit_storage.py
+"""
+Rate limit state shared by every uvicorn worker on one host.
+
+`shm://[/path/to/file]` maps a small fixed-size hash table into memory from a
+file (under /dev/shm when available) and guards it with an flock, so all
+workers see the same counters and `30/minute` means 30 per client, not
+30 per worker. Without a path the file is named after RATELIMIT_SHM_NAME, or
+else the app's working directory, so separate deployments on one host don't
+share a table. Importing this module registers the `shm` storage scheme and
+the `token-bucket` strategy with `limits`, which slowapi builds on.
+"""
+import os
+import mmap
+import time
+import struct
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from limits.errors import ConfigurationError
+from limits.storage import Storage
+from limits.strategies import STRATEGIES, RateLimiter
+from limits.util import WindowStats
+
+try:
+    import fcntl
+except ImportError:  # not on Windows
+    fcntl = None
+
+MAGIC = b"ANRL0001"
+HEADER = struct.Struct("<8sQ")  # magic, slot count
+SLOT = struct.Struct("<Qdd")  # key hash, value, timestamp (bucket: tokens/last refill, counter: count/expiry)
+PROBE_LIMIT = 8
+
+
+def default_path() -> str:
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    name = os.getenv("RATELIMIT_SHM_NAME") or hashlib.sha1(os.getcwd().encode()).hexdigest()[:12]
+    return os.path.join(directory, f"applynow-ratelimit-{name}")
+
+
+def key_hash(key: str) -> int:
+    # 0 marks an empty slot
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+
+
+class SharedMemoryStorage(Storage):
+    """
+    Open-addressed table of SLOT records in a shared mmap. A key probes up to
+    PROBE_LIMIT slots; when all are taken by other keys the stalest one is
+    evicted, which at worst forgets an idle client's (nearly refilled) state.
+    """
+
+    STORAGE_SCHEME = ["shm"]
+
+    def __init__(self, uri: str = None, wrap_exceptions: bool = False, slots: int = 65536, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        if fcntl is None:
+            raise ConfigurationError("shm:// rate limit storage needs fcntl (POSIX only)")
+        self.path = urlparse(uri or "").path or default_path()
+        self.slots = int(slots)
+        self._thread_lock = threading.Lock()
+        self._pid = None
+        self._fd = None
+        self._map = None
+        self._open()
+
+    def _close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _open(self):
+        # flock is per open file, so every process (including forked workers) opens its own.
+        # A forked child first drops the mapping and fd it inherited (unlocked outside _locked).
+        self._close()
+        self._pid = os.getpid()
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            size = os.fstat(self._fd).st_size
+            if size >= HEADER.size:
+                magic, slots = HEADER.unpack(os.pread(self._fd, HEADER.size, 0))
+                if magic == MAGIC:
+                    self.slots = slots
+                else:
+                    size = 0
+            if size < HEADER.size:
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, HEADER.size + self.slots * SLOT.size)
+                os.pwrite(self._fd, HEADER.pack(MAGIC, self.slots), 0)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._map = mmap.mmap(self._fd, HEADER.size + self.slots * SLOT.size)
+
+    @contextmanager
+    def _locked(self):
+        with self._thread_lock:
+            if self._pid != os.getpid():
+                self._open()
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _offset(self, index: int) -> int:
+        return HEADER.size + index * SLOT.size
+
+    def _find(self, key: str, create: bool):
+        """Offset of the key's slot and whether it already held this key. Caller holds the lock."""
+        h = key_hash(key)
+        start = h % self.slots
+        empty, stalest, stalest_ts = None, None, None
+        for probe in range(PROBE_LIMIT):
+            offset = self._offset((start + probe) % self.slots)
+            slot_hash, _, ts = SLOT.unpack_from(self._map, offset)
+            if slot_hash == h:
+                return offset, True
+            if slot_hash == 0:
+                if empty is None:
+                    empty = offset
+            elif stalest_ts is None or ts < stalest_ts:
+                stalest, stalest_ts = offset, ts
+        if not create:
+            return None, False
+        victim = empty if empty is not None else stalest
+        SLOT.pack_into(self._map, victim, h, 0.0, 0.0)
+        return victim, False
+
+    # Token bucket, used by TokenBucketRateLimiter
+
+    def acquire(self, key: str, capacity: float, rate: float, cost: float = 1) -> bool:
+        now = time.time()
+        with self._locked():
+            offset, existed = self._find(key, create=True)
+            h, tokens, last = SLOT.unpack_from(self._map, offset)
+            tokens = min(capacity, tokens + (now - last) * rate) if existed else capacity
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            SLOT.pack_into(self._map, offset, h, tokens, now)
+        return allowed
+
+    def peek(self, key: str, capacity: float, rate: float) -> float:
+        now = time.time()
+        with self._locked():
+            offset, existed = self._find(key, create=False)
+            if not existed:
+                return capacity
+            _, tokens, last = SLOT.unpack_from(self._map, offset)
+        return min(capacity, tokens + (now - last) * rate)
+
+    # Fixed window counters, the limits Storage interface
+
+    @property
+    def base_exceptions(self):
+        return (OSError, ValueError)
+
+    def incr(self, key: str, expiry: int, amount: int = 1, **kwargs) -> int:
+        now = time.time()
+        with self._locked():
+            offset, existed = self._find(key, create=True)
+            h, count, expires_at = SLOT.unpack_from(self._map, offset)
+            if not existed or expires_at <= now:
+                count, expires_at = 0, now + expiry
+            count += amount
+            SLOT.pack_into(self._map, offset, h, count, expires_at)
+        return int(count)
+
+    def get(self, key: str) -> int:
+        with self._locked():
+            offset, existed = self._find(key, create=False)
+            if not existed:
+                return 0
+            _, count, expires_at = SLOT.unpack_from(self._map, offset)
+        return int(count) if expires_at > time.time() else 0
+
+    def get_expiry(self, key: str) -> float:
+        with self._locked():
+            offset, existed = self._find(key, create=False)
+            if not existed:
+                return time.time()
+            _, _, expires_at = SLOT.unpack_from(self._map, offset)
+        return expires_at
+
+    def check(self) -> bool:
+        return not self._map.closed
+
+    def clear(self, key: str) -> None:
+        with self._locked():
+            offset, existed = self._find(key, create=False)
+            if existed:
+                SLOT.pack_into(self._map, offset, 0, 0.0, 0.0)
+
+    def reset(self) -> int:
+        cleared = 0
+        with self._locked():
+            for index in range(self.slots):
+                offset = self._offset(index)
+                if SLOT.unpack_from(self._map, offset)[0]:
+                    SLOT.pack_into(self._map, offset, 0, 0.0, 0.0)
+                    cleared += 1
+        return cleared
+
+
+class TokenBucketRateLimiter(RateLimiter):
+    """
+    `30/minute` becomes a bucket of 30 tokens refilled continuously at
+    30 per minute: bursts up to the limit, then a steady rate, and no
+    window-boundary double bursts like fixed-window has.
+    """
+
+    def __init__(self, storage):
+        if not hasattr(storage, "acquire"):
+            raise ConfigurationError("token-bucket strategy needs shm:// storage")
+        super().__init__(storage)
+
+    def _bucket(self, item):
+        return item.amount, item.amount / item.get_expiry()
+
+    def hit(self, item, *identifiers, cost: int = 1) -> bool:
+        capacity, rate = self._bucket(item)
+        return self.storage.acquire(item.key_for(*identifiers), capacity, rate, cost)
+
+    def test(self, item, *identifiers, cost: int = 1) -> bool:
+        capacity, rate = self._bucket(item)
+        return self.storage.peek(item.key_for(*identifiers), capacity, rate) >= cost
+
+    def get_window_stats(self, item, *identifiers) -> WindowStats:
+        capacity, rate = self._bucket(item)
+        tokens = self.storage.peek(item.key_for(*identifiers), capacity, rate)
+        return WindowStats(time.time() + (capacity - tokens) / rate, int(tokens))
+
+
+STRATEGIES["token-bucket"] = TokenBucketRateLimiter
@@ -0,0 +1,154 @@
+# response_cache.py
+import os
+import gzip
+import hashlib
+import inspect
+from urllib.parse import urlencode
+from slowapi.errors import RateLimitExceeded
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Match
+
+from database.cache import GenerationCache, cached_data_generation, get_data_generation
+from database.connection import run_in_db_thread
+
+try:
+    import brotli
+except ImportError:  # optional, gzip is always available
+    brotli = None
+
+CACHEABLE_PREFIXES = ("/jobs", "/companies", "/filters")
+MAX_AGE = int(os.getenv("RESPONSE_CACHE_MAX_AGE", "30"))
+# Total size of the cached bodies (all encodings) per worker
+MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+
+class CachedResponse:
+    def __init__(self, body: bytes, media_type: str, etag: str):
+        self.media_type = media_type
+        self.etag = etag
+        self.bodies = {
+            "identity": body,
+            "gzip": gzip.compress(body, compresslevel=6),
+        }
+        if brotli is not None:
+            self.bodies["br"] = brotli.compress(body, quality=5)
+        self.size = sum(len(body) for body in self.bodies.values())
+
+    def pick_encoding(self, accept_encoding: str) -> str:
+        accepted = {part.split(";")[0].strip().lower() for part in accept_encoding.split(",")}
+        for encoding in ("br", "gzip"):
+            if encoding in accepted and encoding in self.bodies:
+                return encoding
+        return "identity"
+
+
+def cache_key(request) -> str:
+    """Route plus query string with parameters sorted, so ?a=1&b=2 and ?b=2&a=1 share an entry."""
+    params = sorted(request.query_params.multi_items())
+    return f"{request.url.path.rstrip('/')}?{urlencode(params)}"
+
+
+def route_request(request):
+    """
+    The request as the route that would answer it sees it, plus that route's
+    endpoint. /jobs is served by the "/jobs/" route through a slash redirect
+    and shares its cache entry, so both slash forms are tried.
+    """
+    path = request.scope["path"]
+    for candidate in dict.fromkeys((path, path.rstrip("/") + "/", path.rstrip("/"))):
+        scope = {**request.scope, "path": candidate}
+        for route in request.app.router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL and hasattr(route, "endpoint"):
+                return Request(scope, request.receive), route.endpoint
+    return None, None
+
+
+async def check_rate_limit(request):
+    """
+    Apply the route's @limiter.limit to a request answered from the cache. Hits
+    never reach the route and its decorator, so without this a client could
+    hammer cached URLs without limit. Returns the 429 response, or None.
+    """
+    limiter = request.app.state.limiter
+    if not limiter.enabled:
+        return None
+    routed, endpoint = route_request(request)
+    if endpoint is None:
+        return None
+    try:
+        # What the decorator does on a normal call. slowapi has no public hook for
+        # it, so requirements pin slowapi exactly and tests/test_response_cache.py
+        # fails if this goes away or stops limiting.
+        limiter._check_request_limit(routed, endpoint, False)
+    except RateLimitExceeded as exc:
+        handler = request.app.exception_handlers[RateLimitExceeded]
+        response = handler(request, exc)
+        return await response if inspect.isawaitable(response) else response
+    return None
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or etag.removeprefix("W/") in candidates
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """
+    Caches successful GET responses of the read API, keyed on route + normalized
+    query and valid for the current data generation (bumped by the crawler).
+
+    Hits are served from precompressed bodies without touching the route, and
+    clients revalidating with If-None-Match get a bodyless 304. Both still count
+    against the route's rate limit. The cache is bounded by entry count and by
+    the total size of its bodies.
+    """
+
+    def __init__(self, app, max_entries: int = None, max_bytes: int = MAX_BYTES):
+        super().__init__(app)
+        self.cache = GenerationCache(
+            max_entries or int(os.getenv("RESPONSE_CACHE_SIZE", "1024")),
+            max_bytes=max_bytes,
+            sizeof=lambda entry: entry.size,
+        )
+
+    async def dispatch(self, request, call_next):
+        if request.method != "GET" or not request.url.path.startswith(CACHEABLE_PREFIXES):
+            return await call_next(request)
+
+        key = cache_key(request)
+        # Only hop to a DB thread when the TTL'd generation has to be re-read
+        generation = cached_data_generation()
+        if generation is None:
+            generation = await run_in_db_thread(get_data_generation)
+        entry = self.cache.get(key, generation)
+
+        if entry is None:
+            response = await call_next(request)
+            if response.status_code != 200 or "json" not in response.headers.get("content-type", ""):
+                return response
+
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            etag = 'W/"%s"' % hashlib.sha1(b"%d:" % generation + body).hexdigest()
+            entry = CachedResponse(body, response.headers.get("content-type", "application/json"), etag)
+            self.cache.set(key, generation, entry)
+        else:
+            limited = await check_rate_limit(request)
+            if limited is not None:
+                return limited
+
+        headers = {
+            "ETag": entry.etag,
+            "Cache-Control": f"public, max-age={MAX_AGE}",
+            "Vary": "Accept-Encoding",
+        }
+
+        if etag_matches(request.headers.get("if-none-match", ""), entry.etag):
+            return Response(status_code=304, headers=headers)
+
+        encoding = entry.pick_encoding(request.headers.get("accept-encoding", ""))
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=entry.bodies[encoding], headers=headers, media_type=entry.media_type)
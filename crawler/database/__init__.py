@@ -1,6 +1,8 @@
 import os
 import uuid
 import json
+import zlib
+import hashlib
 import mysql.connector
 from dotenv import load_dotenv
 from typing import Optional
@@ -19,112 +21,385 @@ DB_CONFIG = {
     'database': parsed.path.lstrip('/')
 }
 
+# Archived jobs stay in the hot table this long (for 'archived' alerts and a
+# quick return to the listings) before the archiver moves them to jobs_archive
+ARCHIVE_GRACE_HOURS = int(os.getenv("ARCHIVE_GRACE_HOURS", "24"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+# Links per IN (...) list in the bulk lookups
+LINK_BATCH_SIZE = 500
+# New jobs buffered by a JobWriter before it writes them in one transaction
+WRITE_BATCH_SIZE = int(os.getenv("CRAWL_WRITE_BATCH_SIZE", "10"))
+
+# Columns shared by jobs and jobs_archive
+ARCHIVE_COLUMNS = """
+    id, company_id, title, location_id, job_type_id, description_hash, description_text, link,
+    salary_min, salary_max, work_model, industry_id, seniority, technologies,
+    is_winnipeg, department, min_experience, date_added, last_seen
+"""
+
+# Low-cardinality job fields stored as ids into a lookup table (name VARCHAR(512))
+DICTIONARIES = {
+    "company": "companies",
+    "location": "locations",
+    "job_type": "job_types",
+    "industry": "industries",
+}
+DICTIONARY_NAME_LENGTH = 512
+# Tells readers (backend snapshot and caches) that job data changed. Run it in
+# the transaction that made the change, only when that changed rows.
+BUMP_DATA_GENERATION = """
+    INSERT INTO data_generation (id, generation) VALUES (1, 1)
+    ON DUPLICATE KEY UPDATE generation = generation + 1
+"""
+_dictionary_ids = {}  # (table, name) -> id; rows are never renamed or deleted
+
 def get_connection():
     return mysql.connector.connect(**DB_CONFIG)
 
 
-def insert_job(job: dict):
-    conn = get_connection()
-    cursor = conn.cursor()
+def dictionary_id(cursor, table: str, name) -> Optional[int]:
+    """Id of `name` in a lookup table, adding it on first sight. Names match case-insensitively, so "NEO" gets Neo's id."""
+    if name is None:
+        return None
+    name = str(name)[:DICTIONARY_NAME_LENGTH]
+    key = (table, name)
+    if key not in _dictionary_ids:
+        cursor.execute(f"INSERT IGNORE INTO {table} (name) VALUES (%s)", (name,))
+        cursor.execute(f"SELECT id FROM {table} WHERE name = %s", (name,))
+        _dictionary_ids[key] = cursor.fetchone()[0]
+    return _dictionary_ids[key]
+
+
+JOB_UPSERT_COLUMNS = """
+    id, company_id, title, location_id, job_type_id, description_hash, description_text, link,
+    salary_min, salary_max, work_model, industry_id, seniority,
+    technologies, is_winnipeg, department, min_experience,
+    archived, last_seen
+"""
+JOB_UPSERT_ROW = "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, FALSE, NOW())"
+JOB_UPSERT_UPDATE = """
+    title=VALUES(title),
+    location_id=VALUES(location_id),
+    job_type_id=VALUES(job_type_id),
+    description_hash=VALUES(description_hash),
+    description_text=VALUES(description_text),
+    salary_min=VALUES(salary_min),
+    salary_max=VALUES(salary_max),
+    work_model=VALUES(work_model),
+    industry_id=VALUES(industry_id),
+    seniority=VALUES(seniority),
+    technologies=VALUES(technologies),
+    is_winnipeg=VALUES(is_winnipeg),
+    department=VALUES(department),
+    min_experience=VALUES(min_experience),
+    archived=FALSE,
+    archived_at=NULL,
+    last_seen=NOW()
+"""
 
-    sql = """
-    INSERT INTO jobs (
-        id, company, title, location, job_type, description_html, link,
-        salary_min, salary_max, work_model, industry, seniority,
-        technologies, is_winnipeg, department, min_experience,
-        archived, last_seen
-    ) VALUES (
-        %s, %s, %s, %s, %s, %s, %s, 
-        %s, %s, %s, %s, %s,
-        %s, %s, %s, %s,
-        FALSE, NOW()
-    )
-    ON DUPLICATE KEY UPDATE
-        title=VALUES(title),
-        location=VALUES(location),
-        job_type=VALUES(job_type),
-        description_html=VALUES(description_html),
-        salary_min=VALUES(salary_min),
-        salary_max=VALUES(salary_max),
-        work_model=VALUES(work_model),
-        industry=VALUES(industry),
-        seniority=VALUES(seniority),
-        technologies=VALUES(technologies),
-        is_winnipeg=VALUES(is_winnipeg),
-        department=VALUES(department),
-        min_experience=VALUES(min_experience),
-        archived=FALSE,
-        last_seen=NOW();
+
+class JobWriter:
     """
+    Unit of work for a crawl's new jobs. `add` buffers a job (and its 'new'
+    alert); `flush` writes the buffer in one transaction: multi-row inserts
+    into job_descriptions, jobs, job_technologies and job_notifications_queue
+    plus one data_generation bump. A job is never stored without its alert.
 
-    cursor.execute(sql, (
-        job.get("id", str(uuid.uuid4())),
-        job["company"],
-        job["title"],
-        job.get("location"),
-        job.get("job_type"),
-        job.get("description_html"),
-        job["link"],
-        job.get("salary_min"),
-        job.get("salary_max"),
-        job.get("work_model"),
-        job.get("industry"),
-        job.get("seniority"),
-        json.dumps(job.get("technologies", [])),
-        job.get("is_winnipeg", False),
-        job.get("department"),
-        job.get("min_experience"),
-    ))
+    Flushes on its own every `batch_size` jobs, so a crash loses at most one
+    batch of enriched postings; those links are simply new again next cycle.
+    """
 
-    conn.commit()
-    cursor.close()
-    conn.close()
+    def __init__(self, batch_size: int = WRITE_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.pending = []  # (job, notify)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
 
+    def add(self, job: dict, notify: bool = True):
+        self.pending.append((job, notify))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
 
-def does_job_exist(link: str) -> bool:
+    def flush(self) -> int:
+        """Write the buffered jobs. Returns how many were written; on error rolls back and raises."""
+        if not self.pending:
+            return 0
+        # Same link twice in one batch: the last version wins, as with one-by-one upserts
+        batch = {}
+        for job, notify in self.pending:
+            previous = batch.get(job["link"])
+            batch[job["link"]] = (job, notify or (previous is not None and previous[1]))
+        self.pending = []
+
+        conn = get_connection()
+        cursor = conn.cursor()
+        try:
+            ids = [{column: dictionary_id(cursor, table, job.get(column)) for column, table in DICTIONARIES.items()}
+                   for job, _ in batch.values()]
+            # Lookup rows are committed on their own, so a cached id always refers to a stored row
+            conn.commit()
+
+            descriptions = {}
+            rows = []
+            for (job, _), job_ids in zip(batch.values(), ids):
+                digest = None
+                if job.get("description_html"):
+                    data = job["description_html"].encode("utf-8")
+                    digest = hashlib.sha256(data).digest()
+                    descriptions.setdefault(digest, data)
+                rows.extend((
+                    job.get("id", str(uuid.uuid4())),
+                    job_ids["company"],
+                    job["title"],
+                    job_ids["location"],
+                    job_ids["job_type"],
+                    digest,
+                    job.get("description_text"),
+                    job["link"],
+                    job.get("salary_min"),
+                    job.get("salary_max"),
+                    job.get("work_model"),
+                    job_ids["industry"],
+                    job.get("seniority"),
+                    json.dumps(job.get("technologies", [])),
+                    job.get("is_winnipeg", False),
+                    job.get("department"),
+                    job.get("min_experience"),
+                ))
+
+            if descriptions:
+                cursor.execute(
+                    f"INSERT IGNORE INTO job_descriptions (hash, body) VALUES {_in_list(descriptions, '(%s, %s)')}",
+                    [v for digest, data in descriptions.items() for v in (digest, zlib.compress(data))],
+                )
+            cursor.execute(f"""
+                INSERT INTO jobs ({JOB_UPSERT_COLUMNS})
+                VALUES {_in_list(batch, JOB_UPSERT_ROW)}
+                ON DUPLICATE KEY UPDATE {JOB_UPSERT_UPDATE}
+            """, rows)
+
+            # On duplicate link a row keeps its original id, so look them up
+            links = list(batch)
+            cursor.execute(f"SELECT id, link FROM jobs WHERE link IN ({_in_list(links)})", links)
+            job_ids = {link: job_id for job_id, link in cursor.fetchall()}
+            id_list = list(job_ids.values())
+
+            cursor.execute(f"DELETE FROM job_technologies WHERE job_id IN ({_in_list(id_list)})", id_list)
+            pairs = [(job_ids[link], tech) for link, (job, _) in batch.items()
+                     for tech in sorted({normalize_technology(t) for t in job.get("technologies") or [] if t and str(t).strip()})]
+            if pairs:
+                cursor.execute(
+                    f"INSERT INTO job_technologies (job_id, technology) VALUES {_in_list(pairs, '(%s, %s)')}",
+                    [v for pair in pairs for v in pair],
+                )
+
+            notify_ids = [job_ids[link] for link, (_, notify) in batch.items() if notify]
+            if notify_ids:
+                # One alert per job until tgalerts has sent it
+                cursor.execute(f"""
+                    INSERT INTO job_notifications_queue (job_id, event_type)
+                    SELECT id, 'new' FROM jobs
+                    WHERE id IN ({_in_list(notify_ids)})
+                    AND NOT EXISTS (
+                        SELECT 1 FROM job_notifications_queue q
+                        WHERE q.job_id = jobs.id AND q.event_type = 'new' AND q.notified = FALSE
+                    )
+                """, notify_ids)
+
+            cursor.execute(BUMP_DATA_GENERATION)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+        print(f"💾 Wrote {len(batch)} jobs ({len(notify_ids)} alerts queued)")
+        return len(batch)
+
+
+def normalize_technology(tech: str) -> str:
+    return str(tech).strip().lower()[:64]
+
+
+def replace_job_technologies(cursor, job_id: str, technologies: list):
+    """Rewrite the job_technologies rows for a job from its enriched technologies list."""
+    cursor.execute("DELETE FROM job_technologies WHERE job_id = %s", (job_id,))
+    techs = sorted({normalize_technology(t) for t in technologies if t and str(t).strip()})
+    if not techs:
+        return
+    placeholders = ", ".join(["(%s, %s)"] * len(techs))
+    values = [v for tech in techs for v in (job_id, tech)]
+    cursor.execute(f"INSERT INTO job_technologies (job_id, technology) VALUES {placeholders}", values)
+
+
+def archive_missing_jobs(company: str, active_links: list[str]) -> int:
+    """
+    Archive this company's jobs whose link is not in the latest crawl and queue
+    an 'archived' alert for each, as one set-based diff: the crawl's links go
+    into a temporary table (one multi-row insert per LINK_BATCH_SIZE links) and
+    the alert insert and archive update are anti-joins against it. Bumps
+    data_generation in the same transaction if any job was archived, so a
+    crawl that found nothing gone leaves the backend caches alone. Returns
+    the number archived.
+    """
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT 1 FROM jobs WHERE link = %s LIMIT 1", (link,))
-    result = cursor.fetchone()
-    cursor.close()
-    conn.close()
-    return result is not None
+    # Same type and collation as jobs.link, so the joins can use its unique index
+    cursor.execute("CREATE TEMPORARY TABLE crawl_links (PRIMARY KEY (link)) SELECT link FROM jobs LIMIT 0")
+    try:
+        for chunk in _chunks(list(dict.fromkeys(active_links))):
+            cursor.execute(f"INSERT INTO crawl_links (link) VALUES {_in_list(chunk, '(%s)')}", chunk)
+
+        missing_join = "jobs LEFT JOIN crawl_links ON crawl_links.link = jobs.link"
+        missing_where = """
+            jobs.company_id = (SELECT id FROM companies WHERE name = %s)
+            AND jobs.archived = FALSE
+            AND crawl_links.link IS NULL
+        """
+        # Alerts first: the update below takes these jobs out of the missing set
+        cursor.execute(f"""
+            INSERT INTO job_notifications_queue (job_id, event_type)
+            SELECT jobs.id, 'archived' FROM {missing_join}
+            WHERE {missing_where}
+            AND NOT EXISTS (
+                SELECT 1 FROM job_notifications_queue q
+                WHERE q.job_id = jobs.id AND q.event_type = 'archived' AND q.notified = FALSE
+            )
+        """, (company,))
+        cursor.execute(f"UPDATE {missing_join} SET jobs.archived = TRUE, jobs.archived_at = NOW() WHERE {missing_where}", (company,))
+        archived = cursor.rowcount
+        if archived:
+            # archived/last_seen changed for this company's jobs
+            cursor.execute(BUMP_DATA_GENERATION)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        # Closing the connection drops the temporary table
+        cursor.close()
+        conn.close()
+    return archived
 
 
-def update_last_seen(link: str):
+def archive_stale_jobs(grace_hours: int = ARCHIVE_GRACE_HOURS, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """
+    Move jobs archived more than `grace_hours` ago from jobs to jobs_archive, in
+    batches so no transaction holds many row locks. Jobs with an unsent 'new'
+    alert stay until tgalerts has sent it: the move deletes from jobs, which
+    drops the job's queued alerts. Nothing reads 'archived' alerts, so those
+    don't hold a job back and go with it. Returns the number moved.
+    """
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("UPDATE jobs SET last_seen = NOW(), archived = FALSE WHERE link = %s", (link,))
-    conn.commit()
+    moved = 0
+    while True:
+        cursor.execute("""
+            SELECT id FROM jobs
+            WHERE archived = TRUE AND archived_at < NOW() - INTERVAL %s HOUR
+            AND NOT EXISTS (
+                SELECT 1 FROM job_notifications_queue q
+                WHERE q.job_id = jobs.id AND q.event_type = 'new' AND q.notified = FALSE
+            )
+            ORDER BY archived_at
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        """, (grace_hours, batch_size))
+        ids = [row[0] for row in cursor.fetchall()]
+        if not ids:
+            conn.commit()
+            break
+
+        placeholders = ", ".join(["%s"] * len(ids))
+        # REPLACE: a job archived, restored and archived again already has an archive row.
+        # Deleting from jobs cascades to its job_technologies and notifications.
+        cursor.execute(f"""
+            REPLACE INTO jobs_archive ({ARCHIVE_COLUMNS}, archived_at)
+            SELECT {ARCHIVE_COLUMNS}, archived_at FROM jobs WHERE id IN ({placeholders})
+        """, ids)
+        cursor.execute(f"DELETE FROM jobs WHERE id IN ({placeholders})", ids)
+        conn.commit()
+        moved += len(ids)
+
     cursor.close()
     conn.close()
+    if moved:
+        print(f"📦 Moved {moved} archived jobs to jobs_archive")
+    return moved
+
+
+def _in_list(values, placeholder: str = "%s") -> str:
+    return ", ".join([placeholder] * len(values))
+
 
+def _chunks(values: list, size: int = LINK_BATCH_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
 
-def archive_missing_jobs(company: str, active_links: list[str]):
-    """Mark jobs from this company as archived if their link is not in the latest crawl."""
+
+def touch_existing_jobs(links: list[str]) -> set[str]:
+    """
+    Existence check and last_seen update for a site's discovered links: one
+    connection, one SELECT and one UPDATE per LINK_BATCH_SIZE links. Returns
+    the links already in jobs; they are marked seen now and un-archived, and
+    data_generation is bumped if that changed any row.
+    """
     conn = get_connection()
     cursor = conn.cursor()
-    format_strings = ','.join(['%s'] * len(active_links)) if active_links else "'-no-links-'"
-    query = f"""
-        UPDATE jobs
-        SET archived = TRUE
-        WHERE company = %s
-        AND (link NOT IN ({format_strings}))
-    """
-    cursor.execute(query, [company] + active_links)
+    existing = set()
+    changed = 0
+    for chunk in _chunks(links):
+        cursor.execute(f"SELECT link FROM jobs WHERE link IN ({_in_list(chunk)})", chunk)
+        found = [row[0] for row in cursor.fetchall()]
+        if found:
+            cursor.execute(f"UPDATE jobs SET last_seen = NOW(), archived = FALSE, archived_at = NULL WHERE link IN ({_in_list(found)})", found)
+            changed += cursor.rowcount
+        existing.update(found)
+    if changed:
+        # Un-archived jobs rejoin the listings, re-seen ones move up the last_seen order
+        cursor.execute(BUMP_DATA_GENERATION)
     conn.commit()
     cursor.close()
     conn.close()
+    return existing
 
 
-def get_all_links_by_company(company: str) -> list[str]:
+def restore_archived_jobs(links: list[str]) -> set[str]:
+    """
+    Move postings that reappeared in a crawl from jobs_archive back into jobs,
+    keeping their ids, and bump data_generation with each batch restored.
+    Returns the restored links.
+    """
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT link FROM jobs WHERE company = %s", (company,))
-    links = [row[0] for row in cursor.fetchall()]
+    restored = set()
+    for chunk in _chunks(links):
+        cursor.execute(f"SELECT link FROM jobs_archive WHERE link IN ({_in_list(chunk)})", chunk)
+        found = [row[0] for row in cursor.fetchall()]
+        if not found:
+            continue
+        placeholders = _in_list(found)
+        cursor.execute(f"""
+            INSERT IGNORE INTO jobs ({ARCHIVE_COLUMNS})
+            SELECT {ARCHIVE_COLUMNS} FROM jobs_archive WHERE link IN ({placeholders})
+        """, found)
+        cursor.execute(f"UPDATE jobs SET last_seen = NOW(), archived = FALSE, archived_at = NULL WHERE link IN ({placeholders})", found)
+        cursor.execute(f"SELECT id, technologies FROM jobs WHERE link IN ({placeholders})", found)
+        for job_id, technologies in cursor.fetchall():
+            replace_job_technologies(cursor, job_id, json.loads(technologies) if technologies else [])
+        cursor.execute(f"DELETE FROM jobs_archive WHERE link IN ({placeholders})", found)
+        cursor.execute(BUMP_DATA_GENERATION)
+        conn.commit()
+        restored.update(found)
     cursor.close()
     conn.close()
-    return links
+    return restored
+
 
 def insert_job_notification(job_id: str, event_type: str = "new"):
     """Insert a new notification into the queue if it doesn't already exist."""
@@ -179,14 +454,3 @@ def insert_notification_for_archived(link: str):
 
     cursor.close()
     conn.close()
-
-def insert_job_notification_by_link(link: str, event_type: str = "new"):
-    """Insert a job notification for a given job link."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT id FROM jobs WHERE link = %s", (link,))
-    row = cursor.fetchone()
-    if row:
-        insert_job_notification(row[0], event_type)
-    cursor.close()
-    conn.close()
\ No newline at end of file
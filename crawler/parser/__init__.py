@@ -1,14 +1,66 @@
+import os
 import time
-from parser import payworks, skipthedishes, neo, priceline, bold, pollard
 import random
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from parser import payworks, skipthedishes, neo, priceline, bold, pollard, http_client, helpers
+import database
+
+# Sites crawled each cycle. Each runs on its own worker, so a slow site no
+# longer holds up the others; politeness delays are per host (helpers.polite_delay).
+SITES = {
+    "Payworks": payworks.extract_job_postings,
+    "Neo": neo.extract_job_postings,
+    "Priceline": priceline.extract_job_postings,
+    "Bold": bold.extract_job_postings,
+    "Pollard": pollard.extract_job_postings,
+}
+CRAWL_CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", str(len(SITES))))
+
+
+def crawl_site(name: str, extract) -> float:
+    started = time.monotonic()
+    with http_client.site(name):
+        try:
+            extract()
+        except Exception as e:
+            # One broken site must not take the whole cycle down
+            print(f"❌ {name} crawl failed: {e}")
+        try:
+            # Jobs a parser upserted but never finalized (or that it failed after)
+            helpers.flush_jobs(name)
+        except Exception as e:
+            print(f"❌ {name}: failed to write new jobs: {e}")
+    stats = http_client.take_stats(name)
+    print(f"📡 {name}: {stats['requests']} requests, {stats['not_modified']} not modified, "
+          f"{stats['errors']} errors, {stats['bytes'] / 1024:.0f} KiB received")
+    return time.monotonic() - started
+
+
+def crawl_all(pool: ThreadPoolExecutor):
+    """Crawl every site concurrently; a cycle takes about as long as the slowest site."""
+    started = time.monotonic()
+    durations = {}
+    futures = {pool.submit(crawl_site, name, extract): name for name, extract in SITES.items()}
+    for future in as_completed(futures):
+        name = futures[future]
+        durations[name] = future.result()
+        print(f"🏁 {name} crawled in {durations[name]:.0f}s")
+
+    elapsed = time.monotonic() - started
+    print(f"🔁 Cycle done in {elapsed:.0f}s (sites back to back: {sum(durations.values()):.0f}s)")
+
 
 def main():
-    while True:
-        payworks.extract_job_postings()
-        neo.extract_job_postings()
-        priceline.extract_job_postings()
-        bold.extract_job_postings()
-        pollard.extract_job_postings()
-        tts = random.randint(60, 300)
-        print(f"Sleeping for {tts} seconds before next cycle...")
-        time.sleep(tts)
\ No newline at end of file
+    # One pool for the life of the process, its workers reused every cycle
+    pool = ThreadPoolExecutor(max_workers=CRAWL_CONCURRENCY, thread_name_prefix="crawl")
+    try:
+        while True:
+            crawl_all(pool)
+            database.archive_stale_jobs()
+            http_client.sweep_cache()
+            tts = random.randint(60, 300)
+            print(f"Sleeping for {tts} seconds before next cycle...")
+            time.sleep(tts)
+    finally:
+        pool.shutdown(wait=True)
+        http_client.close()
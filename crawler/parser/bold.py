@@ -1,39 +1,43 @@
-import requests
-import time
-import random
 from ai import enrich_job_posting
-from parser import helpers
+from parser import helpers, http_client
 
 BASE_LIST_URL = "https://boldcommerce.bamboohr.com/careers/list"
 DETAIL_URL_TEMPLATE = "https://boldcommerce.bamboohr.com/careers/{}/detail"
 
 def extract_job_postings():
     try:
-        resp = requests.get(BASE_LIST_URL, timeout=10)
+        resp = http_client.get(BASE_LIST_URL, timeout=10)
         resp.raise_for_status()
         jobs = resp.json()["result"]
-        all_links = set()
+        postings = {}
 
+        # Links only come with the detail payload, so collect every posting first
         for job in jobs:
             job_id = job["id"]
-            print(f"📄 Processing job ID: {job_id}")
+            print(f"📄 Fetching job ID: {job_id}")
             job_data = fetch_job_detail(job_id)
             if not job_data:
                 continue
-
             job_opening = job_data["jobOpening"]
+            link = job_opening.get("jobOpeningShareUrl")
+            if link:
+                postings[link] = job_opening
+
+        all_links = set(postings)
+        new_links = helpers.filter_new_links(list(postings))
+
+        for link, job_opening in postings.items():
+            if link not in new_links:
+                print(f"🔴 Already exists: {link}")
+                continue
+
             title = job_opening["jobOpeningName"]
             location = job_opening.get("atsLocation", {}).get("city") or "Unknown"
             state = job_opening.get("atsLocation", {}).get("state")
             job_type = job_opening.get("employmentStatusLabel", "Unknown")
             description_html = job_opening.get("description", "")
-            link = job_opening.get("jobOpeningShareUrl")
             date_posted = job_opening.get("datePosted")
 
-            if helpers.does_job_exist(link):
-                print(f"🔴 Already exists: {link}")
-                continue
-
             is_winnipeg = "winnipeg" in (location or "").lower() or "winnipeg" in description_html.lower()
 
             ai_prompt = f"{title}\nLocation: {location}\nType: {job_type}\n\n{description_html}"
@@ -62,10 +66,9 @@ def extract_job_postings():
 
 
             helpers.upsert_job(job_record, "Bold")
-            all_links.add(link)
             print(f"✅ Upserted job: {title} at {location}")
 
-            time.sleep(random.randint(1, 5))
+            helpers.polite_delay(BASE_LIST_URL, 1, 5)
 
         all_links_found = list(all_links)
         helpers.finalize_crawl("Bold", all_links_found)
@@ -76,7 +79,7 @@ def extract_job_postings():
 def fetch_job_detail(job_id):
     try:
         url = DETAIL_URL_TEMPLATE.format(job_id)
-        resp = requests.get(url, timeout=10)
+        resp = http_client.get(url, timeout=10)
         resp.raise_for_status()
         return resp.json()["result"]
     except Exception as e:
@@ -1,28 +1,84 @@
-from typing import List
+import time
+import random
+import threading
+from typing import List, Optional
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup
 import database
 
-def does_job_exist(job_link: str) -> bool:
+# host -> time.monotonic() before which the next request to it should not start
+_host_ready = {}
+_host_lock = threading.Lock()
+# company -> database.JobWriter buffering that site's new jobs until the crawl ends
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def html_to_text(html: Optional[str]) -> Optional[str]:
+    """
+    Plain text of a job description, stored alongside the HTML for full-text search.
+    """
+    if not html:
+        return None
+    return BeautifulSoup(html, "html.parser").get_text(" ", strip=True)
+
+
+def polite_delay(url: str, min_seconds: float, max_seconds: float):
+    """
+    Wait a random min..max seconds before the next request to url's host.
+    Shared by all crawl workers, so delays are per host: sites crawled in
+    parallel don't slow each other down, and two crawls of one host still
+    take turns.
+    """
+    host = urlparse(url).netloc
+    delay = random.uniform(min_seconds, max_seconds)
+    with _host_lock:
+        now = time.monotonic()
+        ready = max(now, _host_ready.get(host, now)) + delay
+        _host_ready[host] = ready
+    print(f"⏱️ Sleeping {ready - now:.1f}s before the next request to {host}...")
+    time.sleep(ready - now)
+
+
+def filter_new_links(job_links: List[str]) -> set:
     """
-    Check if a job posting already exists in the database.
+    Resolve a site's discovered links in bulk. Links already in jobs are
+    marked seen (and un-archived) in one statement, archived postings that
+    reappeared are restored, and only links never seen before are returned
+    for detail fetch and AI enrichment.
     """
-    if database.does_job_exist(job_link):
-        database.update_last_seen(job_link)
-        return True
-    return False
+    links = list(dict.fromkeys(job_links))
+    existing = database.touch_existing_jobs(links)
+    restored = database.restore_archived_jobs([link for link in links if link not in existing])
+    new_links = {link for link in links if link not in existing and link not in restored}
+    print(f"🧮 {len(links)} links: {len(existing)} known, {len(restored)} restored, {len(new_links)} new")
+    return new_links
+
+
+def job_writer(company: str) -> database.JobWriter:
+    with _writers_lock:
+        if company not in _writers:
+            _writers[company] = database.JobWriter()
+        return _writers[company]
+
+
+def flush_jobs(company: str):
+    """Write whatever new jobs are still buffered for `company`. Safe to call more than once."""
+    with _writers_lock:
+        writer = _writers.pop(company, None)
+    if writer:
+        writer.flush()
 
 
 def upsert_job(job_record: dict, company: str):
     """
-    Insert or update a job posting in the database.
-    Will automatically set `company`, manage timestamps, and queue notifications.
+    Queue a newly discovered posting (a link filter_new_links returned) for
+    the database, together with its 'new' alert. Jobs are written in
+    batches; finalize_crawl / flush_jobs write the rest.
     """
     job_record["company"] = company
-
-    if database.does_job_exist(job_record["link"]):
-        database.update_last_seen(job_record["link"])
-    else:
-        database.insert_job(job_record)
-        database.insert_job_notification_by_link(job_record["link"], event_type="new")
+    job_record["description_text"] = html_to_text(job_record.get("description_html"))
+    job_writer(company).add(job_record)
 
 
 def finalize_crawl(company: str, all_links_found: List[str]):
@@ -30,10 +86,8 @@ def finalize_crawl(company: str, all_links_found: List[str]):
     After a crawl is complete for a company, mark jobs as archived
     if they were not in the latest scrape and queue archive alerts.
     """
-    old_links = database.get_all_links_by_company(company)
-    missing_links = [link for link in old_links if link not in all_links_found]
-
-    database.archive_missing_jobs(company, all_links_found)
+    flush_jobs(company)
 
-    for link in missing_links:
-        database.insert_job_notification_by_link(link, event_type="archived")
+    archived = database.archive_missing_jobs(company, all_links_found)
+    if archived:
+        print(f"🗄️ {company}: archived {archived} jobs no longer listed")
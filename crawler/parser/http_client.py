@@ -0,0 +1,238 @@
+"""
+Shared HTTP layer for the site parsers.
+
+- One pooled keep-alive requests.Session per host, shared by the crawl
+  workers for the life of the process (up to HTTP_POOL_SIZE connections per
+  host), with gzip/deflate negotiated by requests. `close()` releases them.
+- An on-disk cache of GET responses that carry an ETag or Last-Modified.
+  The next fetch of the same URL sends If-None-Match / If-Modified-Since;
+  a 304 is answered from disk, so an unchanged page costs headers only.
+  `sweep_cache()` (once per crawl cycle) drops entries not used for
+  HTTP_CACHE_TTL_HOURS and the least recently used ones beyond
+  HTTP_CACHE_MAX_MB, so one-off job pages don't pile up on disk.
+- Requests, 304s, errors and bytes received, counted per site (the name the
+  scheduler sets with `site(...)`, else the host).
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+CACHE_DIR = os.getenv("HTTP_CACHE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".http_cache"))
+POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "4"))
+CACHE_TTL = float(os.getenv("HTTP_CACHE_TTL_HOURS", "72")) * 3600
+CACHE_MAX_BYTES = int(float(os.getenv("HTTP_CACHE_MAX_MB", "200")) * 1024 * 1024)
+
+_local = threading.local()  # .site: current site name
+_sessions = {}  # host -> Session
+_sessions_lock = threading.Lock()
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+@contextmanager
+def site(name: str):
+    """Attribute requests made on this thread to `name` in the stats."""
+    previous = getattr(_local, "site", None)
+    _local.site = name
+    try:
+        yield
+    finally:
+        _local.site = previous
+
+
+def _session(host: str) -> requests.Session:
+    with _sessions_lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            # Workers crawling sites on the same host use the pool concurrently
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[host] = session
+        return session
+
+
+def close():
+    """Close every session and its keep-alive connections."""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+def _record(host: str, response=None, error: bool = False):
+    name = getattr(_local, "site", None) or host
+    with _stats_lock:
+        stats = _stats.setdefault(name, {"requests": 0, "not_modified": 0, "errors": 0, "bytes": 0})
+        stats["requests"] += 1
+        if error:
+            stats["errors"] += 1
+            return
+        if response.status_code == 304:
+            stats["not_modified"] += 1
+        # Content-Length is the size on the wire (compressed); fall back to the decoded body
+        length = response.headers.get("Content-Length")
+        stats["bytes"] += int(length) if length and length.isdigit() else len(response.content)
+
+
+def take_stats(name: str) -> dict:
+    """Counters for one site since the last call, and reset them."""
+    with _stats_lock:
+        return _stats.pop(name, {"requests": 0, "not_modified": 0, "errors": 0, "bytes": 0})
+
+
+def _cache_paths(url: str):
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.json"), os.path.join(CACHE_DIR, f"{key}.body")
+
+
+def _load_cached(url: str):
+    meta_path, body_path = _cache_paths(url)
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            body = f.read()
+    except (OSError, ValueError):
+        return None, None
+    return meta, body
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _store(url: str, response: requests.Response):
+    meta = {
+        "url": url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "encoding": response.encoding,
+        "headers": {key: value for key, value in response.headers.items()
+                    if key.lower() in ("content-type", "etag", "last-modified")},
+    }
+    meta_path, body_path = _cache_paths(url)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Body first: a meta file always has its body
+    _write_atomic(body_path, response.content)
+    _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+
+def _touch(url: str):
+    """Mark an entry as used, for sweep_cache's age and LRU order."""
+    for path in _cache_paths(url):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+
+def sweep_cache(ttl: float = CACHE_TTL, max_bytes: int = CACHE_MAX_BYTES) -> int:
+    """Delete cache entries unused for `ttl` seconds, then the oldest until under `max_bytes`. Returns entries removed."""
+    try:
+        names = set(os.listdir(CACHE_DIR))
+    except FileNotFoundError:
+        return 0
+
+    entries = []  # (last used, bytes, key)
+    for name in names:
+        key, ext = os.path.splitext(name)
+        if ext != ".json":
+            # Left by an interrupted write, or a body whose meta never landed (give
+            # in-flight writes an hour)
+            if ext == ".tmp" or f"{key}.json" not in names:
+                path = os.path.join(CACHE_DIR, name)
+                try:
+                    if time.time() - os.path.getmtime(path) > 3600:
+                        os.remove(path)
+                except OSError:
+                    pass
+            continue
+        try:
+            meta = os.stat(os.path.join(CACHE_DIR, name))
+            body_size = os.path.getsize(os.path.join(CACHE_DIR, f"{key}.body"))
+        except OSError:
+            continue
+        entries.append((meta.st_mtime, meta.st_size + body_size, key))
+
+    entries.sort()
+    cutoff = time.time() - ttl
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for used, size, key in entries:
+        if used >= cutoff and total <= max_bytes:
+            break
+        # Meta first: without it the entry is a miss, never a meta without its body
+        for ext in (".json", ".body"):
+            try:
+                os.remove(os.path.join(CACHE_DIR, key + ext))
+            except OSError:
+                pass
+        total -= size
+        removed += 1
+    if removed:
+        print(f"🧹 HTTP cache: removed {removed} entries, {total / 1024 / 1024:.1f} MiB left")
+    return removed
+
+
+def _from_cache(meta: dict, body: bytes, not_modified: requests.Response) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response.headers = CaseInsensitiveDict(meta["headers"])
+    response.encoding = meta["encoding"]
+    response.url = not_modified.url
+    response.request = not_modified.request
+    response.from_cache = True
+    return response
+
+
+def get(url: str, headers: dict = None, timeout: float = 10, **kwargs) -> requests.Response:
+    """
+    requests.get through the shared session and cache. Raises the same
+    requests exceptions. `response.from_cache` is True when the body came
+    from disk after a 304.
+    """
+    host = urlparse(url).netloc
+    headers = dict(headers or {})
+    cacheable = CACHE_ENABLED and kwargs.get("allow_redirects", True)
+
+    meta, body = _load_cached(url) if cacheable else (None, None)
+    if meta:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        response = _session(host).get(url, headers=headers, timeout=timeout, **kwargs)
+    except requests.RequestException:
+        _record(host, error=True)
+        raise
+    _record(host, response)
+
+    if response.status_code == 304 and meta:
+        _touch(url)
+        return _from_cache(meta, body, response)
+
+    response.from_cache = False
+    if cacheable and response.status_code == 200 and (response.headers.get("ETag") or response.headers.get("Last-Modified")):
+        try:
+            _store(url, response)
+        except OSError as e:
+            print(f"⚠️ Could not cache {url}: {e}")
+    return response
@@ -1,9 +1,7 @@
 import requests
 from bs4 import BeautifulSoup
 from ai import enrich_job_posting
-from parser import helpers
-import time
-import random
+from parser import helpers, http_client
 
 base_url = "https://ats.rippling.com"
 
@@ -17,7 +15,7 @@ def extract_job_postings():
         print(f"Fetching page {page}: {page_url}")
 
         try:
-            response = requests.get(page_url, timeout=10)
+            response = http_client.get(page_url, timeout=10)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, 'html.parser')
 
@@ -45,13 +43,13 @@ def extract_job_postings():
     print(f"\n✅ Total jobs found: {len(all_job_links)}")
     all_job_links = list(all_job_links)
     jobs_length = len(all_job_links)
+    new_links = helpers.filter_new_links(all_job_links)
 
     for index, job_link in enumerate(all_job_links):
         print(f"🔗 Processing job {index + 1}/{jobs_length}: {job_link}")
         try:
             print(f"\n🔍 Processing job: {job_link}")
-            does_job_exist = helpers.does_job_exist(job_link)
-            if does_job_exist:
+            if job_link not in new_links:
                 print(f"🔴 Job already exists: {job_link}")
                 continue
             title, location, department, full_description, html_block, ai_prompt = extract_job_content(job_link)
@@ -88,9 +86,7 @@ def extract_job_postings():
                 helpers.upsert_job(job_record, "Neo")
                 print(f"✅ Successfully processed job: {title} at {location}")
 
-                sleep_time = random.randint(1, 5)
-                print(f"⏱️ Sleeping for {sleep_time} seconds...")
-                time.sleep(sleep_time)
+                helpers.polite_delay(job_link, 1, 5)
 
             except Exception as e:
                 print(f"❌ Failed to build/save job record for {job_link}: {e}")
@@ -105,7 +101,7 @@ def extract_job_postings():
 
 def extract_job_content(job_url: str):
     try:
-        response = requests.get(job_url, timeout=10)
+        response = http_client.get(job_url, timeout=10)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, 'html.parser')
 
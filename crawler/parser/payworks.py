@@ -1,14 +1,12 @@
 import requests
 from bs4 import BeautifulSoup
 from ai import enrich_job_posting
-from parser import helpers
-import time
-import random
+from parser import helpers, http_client
 
 def extract_job_postings():
     url = "https://payworksinc.easyapply.co/"
     try:
-        response = requests.get(url, timeout=10)
+        response = http_client.get(url, timeout=10)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, 'html.parser')
 
@@ -16,9 +14,10 @@ def extract_job_postings():
         job_links = []
         visited_links = set()
 
+        # Resolve every card to its posting URL first, so existence is one bulk lookup
         for index, job in enumerate(job_cards):
             try:
-                print(f"Processing job {index + 1}/{len(job_cards)}: {job.get_text(strip=True)}")
+                print(f"Resolving job {index + 1}/{len(job_cards)}: {job.get_text(strip=True)}")
                 link = job['href']
                 if link in visited_links:
                     continue
@@ -28,59 +27,59 @@ def extract_job_postings():
                 if not actual_job_link:
                     print("⚠️ Failed to resolve actual job link.")
                     continue
-
                 job_links.append(actual_job_link)
-                try:
-                    does_job_exist = helpers.does_job_exist(actual_job_link)
-                    if does_job_exist:
-                        print(f"🔴 Job already exists: {actual_job_link}")
-                        continue
-                    result = extract_job_content(actual_job_link)
-                    if not result:
-                        print(f"⚠️ Skipping due to failed content extraction: {actual_job_link}")
-                        continue
-
-                    title, location, job_type, full_html_description, ai_prompt = result
-                    if not title or not location or not full_html_description:
-                        print(f"⚠️ Skipping due to missing fields: {actual_job_link}")
-                        continue
-
-                    try:
-                        json_data = enrich_job_posting(ai_prompt)
-                    except Exception as e:
-                        print(f"⚠️ AI enrichment failed: {e}")
-                        continue
-
-                    job_record = {
-                        "link": actual_job_link,
-                        "title": title,
-                        "location": location,
-                        "job_type": job_type,
-                        "description_html": full_html_description,
-                        "salary_min": json_data.get("salary_min"),
-                        "salary_max": json_data.get("salary_max"),
-                        "work_model": json_data.get("work_model"),
-                        "industry": json_data.get("industry"),
-                        "seniority": json_data.get("seniority"),
-                        "technologies": json_data.get("technologies"),
-                        "is_winnipeg": json_data.get("is_winnipeg"),
-                        "department": json_data.get("department"),
-                        "min_experience": json_data.get("min_experience"),
-                    }
-
-                    helpers.upsert_job(job_record, "Payworks")
-                    print(f"✅ Successfully processed job: {title} at {location}")
-
-                    sleep_time = random.randint(1, 10)
-                    print(f"⏱️ Sleeping {sleep_time}s to be kind to the server...")
-                    time.sleep(sleep_time)
 
+            except Exception as e:
+                print(f"❌ Failed to process a job card: {e}")
+                continue
+
+        new_links = helpers.filter_new_links(job_links)
+
+        for actual_job_link in job_links:
+            if actual_job_link not in new_links:
+                print(f"🔴 Job already exists: {actual_job_link}")
+                continue
+            try:
+                result = extract_job_content(actual_job_link)
+                if not result:
+                    print(f"⚠️ Skipping due to failed content extraction: {actual_job_link}")
+                    continue
+
+                title, location, job_type, full_html_description, ai_prompt = result
+                if not title or not location or not full_html_description:
+                    print(f"⚠️ Skipping due to missing fields: {actual_job_link}")
+                    continue
+
+                try:
+                    json_data = enrich_job_posting(ai_prompt)
                 except Exception as e:
-                    print(f"❌ Unexpected failure processing job {actual_job_link}: {e}")
+                    print(f"⚠️ AI enrichment failed: {e}")
                     continue
 
+                job_record = {
+                    "link": actual_job_link,
+                    "title": title,
+                    "location": location,
+                    "job_type": job_type,
+                    "description_html": full_html_description,
+                    "salary_min": json_data.get("salary_min"),
+                    "salary_max": json_data.get("salary_max"),
+                    "work_model": json_data.get("work_model"),
+                    "industry": json_data.get("industry"),
+                    "seniority": json_data.get("seniority"),
+                    "technologies": json_data.get("technologies"),
+                    "is_winnipeg": json_data.get("is_winnipeg"),
+                    "department": json_data.get("department"),
+                    "min_experience": json_data.get("min_experience"),
+                }
+
+                helpers.upsert_job(job_record, "Payworks")
+                print(f"✅ Successfully processed job: {title} at {location}")
+
+                helpers.polite_delay(actual_job_link, 1, 10)
+
             except Exception as e:
-                print(f"❌ Failed to process a job card: {e}")
+                print(f"❌ Unexpected failure processing job {actual_job_link}: {e}")
                 continue
 
         helpers.finalize_crawl("Payworks", job_links)
@@ -91,7 +90,7 @@ def extract_job_postings():
 
 def resolve_actual_job_link(slug_url: str) -> str:
     try:
-        response = requests.get(slug_url, allow_redirects=False, timeout=10)
+        response = http_client.get(slug_url, allow_redirects=False, timeout=10)
         if response.status_code == 302:
             return "https://easyapply.co" + response.headers.get('Location')
         else:
@@ -104,7 +103,7 @@ def resolve_actual_job_link(slug_url: str) -> str:
 
 def extract_job_content(actual_url: str):
     try:
-        response = requests.get(actual_url, timeout=10)
+        response = http_client.get(actual_url, timeout=10)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, 'html.parser')
 
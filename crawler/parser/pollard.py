@@ -1,9 +1,7 @@
 import requests
 from bs4 import BeautifulSoup
 from ai import enrich_job_posting
-from parser import helpers
-import time
-import random
+from parser import helpers, http_client
 
 BASE_URL = "https://www.pollardbanknote.com/technology-digital/"
 
@@ -14,7 +12,7 @@ HEADERS = {
 
 def extract_job_postings():
     try:
-        response = requests.get(BASE_URL, headers=HEADERS, timeout=10)
+        response = http_client.get(BASE_URL, headers=HEADERS, timeout=10)
         response.raise_for_status()
 
         soup = BeautifulSoup(response.text, "html.parser")
@@ -22,6 +20,12 @@ def extract_job_postings():
 
         visited_links = set()
         job_titles = soup.find_all("h3", class_="elementor-post__title")
+        found_links = []
+        for title in job_titles:
+            a_tag = title.find("a")
+            if a_tag and a_tag.get("href"):
+                found_links.append(a_tag["href"])
+        new_links = helpers.filter_new_links(found_links)
 
         for index, title in enumerate(job_titles):
             try:
@@ -36,7 +40,7 @@ def extract_job_postings():
 
                 print(f"🔎 Processing job {index + 1}: {link}")
 
-                if helpers.does_job_exist(link):
+                if link not in new_links:
                     print(f"🔴 Job already exists: {link}")
                     continue
 
@@ -76,7 +80,7 @@ def extract_job_postings():
                 helpers.upsert_job(job_record, "Pollard")
                 print(f"✅ Inserted: {title} at {location}")
 
-                time.sleep(random.randint(1, 6))
+                helpers.polite_delay(link, 1, 6)
 
             except Exception as e:
                 print(f"❌ Failed processing job link: {e}")
@@ -89,7 +93,7 @@ def extract_job_postings():
 
 def extract_job_content(url: str):
     try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
+        response = http_client.get(url, headers=HEADERS, timeout=10)
         response.raise_for_status()
 
         soup = BeautifulSoup(response.text, "html.parser")
@@ -1,9 +1,7 @@
 import requests
 from bs4 import BeautifulSoup, Tag
 from ai import enrich_job_posting
-from parser import helpers
-import time
-import random
+from parser import helpers, http_client
 
 allowed_departments = [
     "software_engineering",
@@ -29,7 +27,7 @@ def extract_job_postings():
             "Cache-Control": "no-cache",
         }
 
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_client.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, "html.parser")
 
@@ -42,6 +40,7 @@ def extract_job_postings():
             if href and "careers.priceline.com/job/" in href:
                 job_links.append(href)
         visited_links = set()
+        new_links = helpers.filter_new_links(job_links)
 
         for index, job_url in enumerate(job_links):
             try:
@@ -49,7 +48,7 @@ def extract_job_postings():
 
                 print(f"🔎 Processing job {index + 1}/{len(job_links)}: {job_url}")
 
-                if helpers.does_job_exist(job_url):
+                if job_url not in new_links:
                     print(f"🔴 Job already exists: {job_url}")
                     continue
 
@@ -95,7 +94,7 @@ def extract_job_postings():
                 helpers.upsert_job(job_record, "Priceline")
                 print(f"✅ Successfully processed: {title} at {location}")
 
-                time.sleep(random.randint(1, 10))
+                helpers.polite_delay(url, 1, 10)
 
             except Exception as e:
                 print(f"❌ Failed processing job card: {e}")
@@ -116,7 +115,7 @@ def extract_job_content(url: str):
             "Referer": "https://careers.priceline.com/?s=&post_type=job&_job_location=winnipeg",
             "Cache-Control": "no-cache",
         }
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_client.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, 'html.parser')
 
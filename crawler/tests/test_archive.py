@@ -0,0 +1,47 @@
+def run(database, sql: str, values=()) -> list:
+    conn = database.get_connection()
+    cursor = conn.cursor()
+    cursor.execute(sql, values)
+    rows = cursor.fetchall() if cursor.with_rows else []
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return rows
+
+
+def add_job(database, link: str, notify: bool = False):
+    with database.JobWriter() as writer:
+        writer.add({"company": "Neo", "title": "Backend Developer", "link": link, "technologies": ["python"]}, notify=notify)
+
+
+def age_archive(database, hours: int):
+    """Pretend every archived job was archived `hours` ago."""
+    run(database, "UPDATE jobs SET archived_at = NOW() - INTERVAL %s HOUR, last_seen = last_seen WHERE archived = TRUE", (hours,))
+
+
+def test_archived_alert_does_not_block_the_move(db):
+    add_job(db, "https://example.com/jobs/1")
+
+    assert db.archive_missing_jobs("Neo", []) == 1
+    assert run(db, "SELECT event_type, notified FROM job_notifications_queue") == [("archived", 0)]
+
+    # Still inside the grace period
+    assert db.archive_stale_jobs(grace_hours=24) == 0
+
+    age_archive(db, 25)
+    assert db.archive_stale_jobs(grace_hours=24) == 1
+    assert run(db, "SELECT COUNT(*) FROM jobs") == [(0,)]
+    assert run(db, "SELECT link FROM jobs_archive") == [("https://example.com/jobs/1",)]
+    assert run(db, "SELECT COUNT(*) FROM job_notifications_queue") == [(0,)]
+
+
+def test_unsent_new_alert_blocks_the_move(db):
+    add_job(db, "https://example.com/jobs/2", notify=True)
+    db.archive_missing_jobs("Neo", [])
+    age_archive(db, 25)
+
+    assert db.archive_stale_jobs(grace_hours=24) == 0
+    assert run(db, "SELECT COUNT(*) FROM jobs") == [(1,)]
+
+    run(db, "UPDATE job_notifications_queue SET notified = TRUE WHERE event_type = 'new'")
+    assert db.archive_stale_jobs(grace_hours=24) == 1
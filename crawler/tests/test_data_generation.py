@@ -0,0 +1,45 @@
+from test_archive import run, add_job, age_archive
+
+
+def generation(database) -> int:
+    rows = run(database, "SELECT generation FROM data_generation WHERE id = 1")
+    return rows[0][0] if rows else 0
+
+
+def test_touch_bumps_generation_when_it_changes_rows(db):
+    add_job(db, "https://example.com/jobs/1")
+    db.archive_missing_jobs("Neo", [])
+    before = generation(db)
+
+    assert db.touch_existing_jobs(["https://example.com/jobs/1"]) == {"https://example.com/jobs/1"}
+    assert run(db, "SELECT archived FROM jobs") == [(0,)]
+    assert generation(db) == before + 1
+
+
+def test_touch_of_unknown_links_keeps_generation(db):
+    before = generation(db)
+    assert db.touch_existing_jobs(["https://example.com/jobs/unknown"]) == set()
+    assert generation(db) == before
+
+
+def test_restore_bumps_generation(db):
+    add_job(db, "https://example.com/jobs/2")
+    db.archive_missing_jobs("Neo", [])
+    age_archive(db, 25)
+    assert db.archive_stale_jobs(grace_hours=24) == 1
+    before = generation(db)
+
+    assert db.restore_archived_jobs(["https://example.com/jobs/2"]) == {"https://example.com/jobs/2"}
+    assert run(db, "SELECT archived FROM jobs") == [(0,)]
+    assert generation(db) == before + 1
+
+
+def test_archive_without_missing_jobs_keeps_generation(db):
+    add_job(db, "https://example.com/jobs/3")
+    before = generation(db)
+
+    assert db.archive_missing_jobs("Neo", ["https://example.com/jobs/3"]) == 0
+    assert generation(db) == before
+
+    assert db.archive_missing_jobs("Neo", []) == 1
+    assert generation(db) == before + 1
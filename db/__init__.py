@@ -1,10 +1,41 @@
+"""
+Versioned schema migrations.
+
+Each file in migrations/ is one step, NNNN_name.py with an `up(m)` function.
+Applied versions are recorded in schema_migrations, so a run only executes
+what is new. Steps are written to be idempotent (create-if-missing, add
+column/index only when absent) because MySQL DDL commits implicitly: a step
+that fails halfway is simply re-run.
+
+Column and index changes go through the helpers on `Migration`, which ask
+MySQL for online algorithms (INSTANT, or INPLACE with LOCK=NONE) and fail
+rather than silently taking a blocking table lock. The one exception is a
+table with a FULLTEXT index: InnoDB can't add or drop its columns instantly
+or with concurrent writes, so those rebuilds run with LOCK=SHARED (reads
+still served) and say so.
+
+    python3 __init__.py            # apply pending migrations
+    python3 __init__.py status     # list applied / pending
+    python3 __init__.py up 3       # apply up to version 3
+"""
 import os
+import sys
+import time
+import importlib.util
 import mysql.connector
+from mysql.connector import errors
 from dotenv import load_dotenv
 
-SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "schema.sql")
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "migrations")
+LOCK_NAME = "applynow_schema_migrations"
+# Give up on a metadata lock quickly instead of queueing every query behind our ALTER
+LOCK_WAIT_TIMEOUT = int(os.getenv("MIGRATION_LOCK_WAIT_TIMEOUT", "10"))
 
-def apply_schema():
+# MySQL refuses the requested ALGORITHM/LOCK for this change
+ALTER_NOT_SUPPORTED = (1845, 1846)
+
+
+def get_config():
     load_dotenv()
 
     db_url = os.getenv("DATABASE_URL")
@@ -15,7 +46,7 @@ def apply_schema():
     import urllib.parse as urlparse
     parsed = urlparse.urlparse(db_url)
 
-    config = {
+    return {
         'host': parsed.hostname,
         'port': parsed.port or 3306,
         'user': parsed.username,
@@ -23,25 +54,210 @@ def apply_schema():
         'database': parsed.path.lstrip('/'),
     }
 
+
+class Migration:
+    """What a migration's `up(m)` gets: a cursor plus idempotent, online DDL helpers."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.cursor = conn.cursor()
+
+    def execute(self, sql: str, values=()):
+        self.cursor.execute(sql, values)
+
+    def commit(self):
+        self.conn.commit()
+
+    def table_exists(self, table: str) -> bool:
+        self.cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.tables
+            WHERE table_schema = DATABASE() AND table_name = %s
+        """, (table,))
+        return self.cursor.fetchone()[0] > 0
+
+    def column_exists(self, table: str, column: str) -> bool:
+        self.cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.columns
+            WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+        """, (table, column))
+        return self.cursor.fetchone()[0] > 0
+
+    def index_exists(self, table: str, index: str) -> bool:
+        self.cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+        """, (table, index))
+        return self.cursor.fetchone()[0] > 0
+
+    def column_charset(self, table: str, column: str) -> str:
+        """CHARACTER SET / COLLATE of an existing column, for columns that must match it (foreign keys, joins)."""
+        self.cursor.execute("""
+            SELECT character_set_name, collation_name FROM information_schema.columns
+            WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+        """, (table, column))
+        charset, collation = self.cursor.fetchone()
+        return f"CHARACTER SET {charset} COLLATE {collation}"
+
+    def has_fulltext_index(self, table: str) -> bool:
+        self.cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = %s AND index_type = 'FULLTEXT'
+        """, (table,))
+        return self.cursor.fetchone()[0] > 0
+
+    def alter_column(self, table: str, change: str):
+        """
+        Instant where MySQL can, otherwise an in-place rebuild that keeps the
+        table writable. Tables with a FULLTEXT index support neither, so they
+        are rebuilt in place with LOCK=SHARED: reads go on, writes wait.
+        """
+        try:
+            self.execute(f"ALTER TABLE {table} {change}, ALGORITHM=INSTANT")
+            return
+        except errors.DatabaseError as e:
+            if e.errno not in ALTER_NOT_SUPPORTED:
+                raise
+        try:
+            self.execute(f"ALTER TABLE {table} {change}, ALGORITHM=INPLACE, LOCK=NONE")
+        except errors.DatabaseError as e:
+            if e.errno not in ALTER_NOT_SUPPORTED or not self.has_fulltext_index(table):
+                raise
+            print(f"⚠️ {table} has a FULLTEXT index, rebuilding with LOCK=SHARED (writes wait)...")
+            self.execute(f"ALTER TABLE {table} {change}, ALGORITHM=INPLACE, LOCK=SHARED")
+
+    def add_column(self, table: str, column: str, definition: str):
+        """Instant where MySQL can (8.0.12+), otherwise see `alter_column`."""
+        if self.column_exists(table, column):
+            return
+        print(f"➕ Adding {table}.{column}...")
+        self.alter_column(table, f"ADD COLUMN {column} {definition}")
+
+    def drop_column(self, table: str, column: str):
+        """Instant on MySQL 8.0.29+, otherwise see `alter_column`."""
+        if not self.column_exists(table, column):
+            return
+        print(f"➖ Dropping {table}.{column}...")
+        self.alter_column(table, f"DROP COLUMN {column}")
+
+    def add_index(self, table: str, index: str, columns: str, kind: str = "INDEX"):
+        """kind is INDEX, UNIQUE INDEX or FULLTEXT INDEX. FULLTEXT builds allow reads but not writes (LOCK=SHARED)."""
+        if self.index_exists(table, index):
+            return
+        lock = "SHARED" if kind.upper().startswith("FULLTEXT") else "NONE"
+        print(f"🔎 Building {kind.lower()} {table}.{index} ({columns})...")
+        self.execute(f"ALTER TABLE {table} ADD {kind} {index} ({columns}), ALGORITHM=INPLACE, LOCK={lock}")
+
+    def drop_index(self, table: str, index: str):
+        if not self.index_exists(table, index):
+            return
+        print(f"🗑️ Dropping index {table}.{index}...")
+        self.execute(f"ALTER TABLE {table} DROP INDEX {index}, ALGORITHM=INPLACE, LOCK=NONE")
+
+    def close(self):
+        self.cursor.close()
+
+
+def load_migrations() -> list:
+    """[(version, name, module)] sorted by version."""
+    migrations = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        if not filename.endswith(".py") or not filename[:4].isdigit():
+            continue
+        version, name = int(filename[:4]), filename[5:-3]
+        spec = importlib.util.spec_from_file_location(f"migration_{filename[:-3]}", os.path.join(MIGRATIONS_DIR, filename))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        migrations.append((version, name, module))
+
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"Duplicate migration versions in {MIGRATIONS_DIR}")
+    return migrations
+
+
+def applied_versions(cursor) -> dict:
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            duration_ms INT
+        )
+    """)
+    cursor.execute("SELECT version, applied_at FROM schema_migrations")
+    return dict(cursor.fetchall())
+
+
+def migrate(target: int = None):
+    conn = mysql.connector.connect(**get_config())
+    cursor = conn.cursor()
+    cursor.execute(f"SET SESSION lock_wait_timeout = {LOCK_WAIT_TIMEOUT}")
+
+    # One runner at a time, e.g. two deploys starting together
+    cursor.execute("SELECT GET_LOCK(%s, 0)", (LOCK_NAME,))
+    if cursor.fetchone()[0] != 1:
+        cursor.close()
+        conn.close()
+        raise RuntimeError("Another migration run holds the lock")
+
     try:
-        print("🔌 Connecting to MySQL...")
-        conn = mysql.connector.connect(**config)
-        cursor = conn.cursor()
-
-        print("📄 Applying schema...")
-        with open(SCHEMA_PATH, "r") as f:
-            schema_sql = f.read()
-            for statement in schema_sql.split(";"):
-                if statement.strip():
-                    cursor.execute(statement)
-
-        conn.commit()
+        applied = applied_versions(cursor)
+        pending = [(v, n, mod) for v, n, mod in load_migrations()
+                   if v not in applied and (target is None or v <= target)]
+        if not pending:
+            print("✅ Schema is up to date.")
+            return
+
+        for version, name, module in pending:
+            print(f"🚚 Applying {version:04d}_{name}...")
+            started = time.monotonic()
+            migration = Migration(conn)
+            try:
+                module.up(migration)
+                conn.commit()
+            finally:
+                migration.close()
+            duration_ms = int((time.monotonic() - started) * 1000)
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, name, duration_ms) VALUES (%s, %s, %s)",
+                (version, name, duration_ms),
+            )
+            conn.commit()
+            print(f"✅ {version:04d}_{name} applied in {duration_ms}ms")
+    finally:
+        cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+        cursor.fetchone()
         cursor.close()
         conn.close()
-        print("✅ Schema applied successfully.")
 
-    except Exception as e:
-        print(f"❌ Failed to apply schema: {e}")
+
+def status():
+    conn = mysql.connector.connect(**get_config())
+    cursor = conn.cursor()
+    applied = applied_versions(cursor)
+    cursor.close()
+    conn.close()
+
+    for version, name, module in load_migrations():
+        state = f"applied {applied[version]}" if version in applied else "pending"
+        summary = (module.__doc__ or "").strip().splitlines()[0] if module.__doc__ else ""
+        print(f"{version:04d}_{name:28} {state:30} {summary}")
+
+
+def apply_schema():
+    """Kept for callers of the old entry point; schema changes now ship as migrations."""
+    migrate()
+
 
 if __name__ == "__main__":
-    apply_schema()
+    command = sys.argv[1] if len(sys.argv) > 1 else "up"
+    try:
+        if command == "status":
+            status()
+        elif command == "up":
+            migrate(int(sys.argv[2]) if len(sys.argv) > 2 else None)
+        else:
+            raise SystemExit(f"Unknown command {command!r}, expected up or status")
+    except (errors.Error, RuntimeError, ValueError) as e:
+        print(f"❌ Migration failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,104 @@
+"""Tables as they were before versioned migrations (jobs, notifications, users, alerts, analytics)."""
+
+
+def up(m):
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id CHAR(36) PRIMARY KEY,
+
+            company VARCHAR(128) NOT NULL,
+            title TEXT NOT NULL,
+            location TEXT,
+            job_type TEXT,
+            description_html TEXT,
+            link VARCHAR(512) UNIQUE NOT NULL,
+
+            salary_min INT,
+            salary_max INT,
+            work_model ENUM('remote', 'on-site', 'hybrid'),
+            industry TEXT,
+            seniority ENUM('entry', 'mid', 'senior', 'lead'),
+            technologies JSON,
+            is_winnipeg BOOLEAN DEFAULT FALSE,
+            department ENUM(
+                'software_engineering',
+                'management',
+                'design',
+                'marketing',
+                'sales',
+                'hr',
+                'finance',
+                'support',
+                'operations',
+                'other'
+            ),
+            min_experience INT,
+
+            archived BOOLEAN DEFAULT FALSE,
+            date_added TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+            INDEX idx_archived_company (archived, company),
+            INDEX idx_is_winnipeg (is_winnipeg),
+            INDEX idx_last_seen (last_seen)
+        )
+    """)
+
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS job_notifications_queue (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            job_id CHAR(36) NOT NULL,  -- UUID as CHAR(36)
+            event_type ENUM('new', 'archived') NOT NULL DEFAULT 'new',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            notified BOOLEAN DEFAULT FALSE,
+
+            INDEX idx_notified_event (notified, event_type),
+            FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE
+        )
+    """)
+
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id BIGINT PRIMARY KEY,  -- Telegram user ID
+            username VARCHAR(64),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS job_alert_filters (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id BIGINT NOT NULL,
+
+            is_active BOOLEAN DEFAULT TRUE,         -- Whether alerts are currently enabled
+            is_winnipeg BOOLEAN,                    -- Optional filter
+
+            salary_min INT,
+            salary_max INT,
+
+            work_models JSON,                       -- e.g. ["remote", "on-site"]
+            seniorities JSON,                       -- e.g. ["entry", "mid"]
+            companies JSON,                         -- e.g. ["Neo", "Bold"]
+            departments JSON,                       -- e.g. ["software_engineering", "design"]
+
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+            INDEX idx_alerts_user_id (user_id),
+            INDEX idx_alerts_is_active (is_active),
+            INDEX idx_alerts_created_at (created_at),
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+    """)
+
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS page_analytics (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            hashed_ip CHAR(64) NOT NULL, -- SHA-256 hex length
+            path VARCHAR(255) NOT NULL,
+            user_agent TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+            -- Counting unique viewers per page
+            INDEX idx_path_hashed_ip (path, hashed_ip)
+        )
+    """)
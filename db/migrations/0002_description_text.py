@@ -0,0 +1,48 @@
+"""jobs.description_text (plain text of description_html) and its FULLTEXT index for search."""
+from html.parser import HTMLParser
+
+BATCH_SIZE = 500
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+
+    def handle_data(self, data):
+        data = data.strip()
+        if data:
+            self.parts.append(data)
+
+
+def html_to_text(html):
+    if not html:
+        return None
+    extractor = _TextExtractor()
+    extractor.feed(html)
+    return " ".join(extractor.parts)
+
+
+def up(m):
+    m.add_column("jobs", "description_text", "MEDIUMTEXT AFTER description_html")
+
+    # Fill text before building the index so it is built once over the final data
+    total = 0
+    while True:
+        m.execute("""
+            SELECT id, description_html FROM jobs
+            WHERE description_text IS NULL AND description_html IS NOT NULL
+            LIMIT %s
+        """, (BATCH_SIZE,))
+        rows = m.cursor.fetchall()
+        if not rows:
+            break
+        m.cursor.executemany(
+            "UPDATE jobs SET description_text = %s WHERE id = %s",
+            [(html_to_text(html) or "", job_id) for job_id, html in rows],
+        )
+        m.commit()
+        total += len(rows)
+        print(f"📝 Backfilled {total} descriptions...")
+
+    m.add_index("jobs", "ft_title_description", "title, description_text", kind="FULLTEXT INDEX")
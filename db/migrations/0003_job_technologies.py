@@ -0,0 +1,45 @@
+"""job_technologies: one row per (job, technology), lower-cased, so tech filters are index lookups."""
+import json
+
+BATCH_SIZE = 500
+
+
+def normalize_technology(tech):
+    return str(tech).strip().lower()[:64]
+
+
+def up(m):
+    # job_id must match jobs.id for the foreign key, also on databases created under older defaults
+    m.execute(f"""
+        CREATE TABLE IF NOT EXISTS job_technologies (
+            job_id CHAR(36) {m.column_charset("jobs", "id")} NOT NULL,
+            technology VARCHAR(64) NOT NULL,
+
+            PRIMARY KEY (technology, job_id),
+            INDEX idx_job_technologies_job (job_id),
+            FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE
+        )
+    """)
+
+    last_id = ""
+    total = 0
+    while True:
+        m.execute("SELECT id, technologies FROM jobs WHERE id > %s ORDER BY id LIMIT %s", (last_id, BATCH_SIZE))
+        rows = m.cursor.fetchall()
+        if not rows:
+            break
+        pairs = []
+        for job_id, technologies in rows:
+            try:
+                techs = json.loads(technologies) if technologies else []
+            except ValueError:
+                techs = []
+            for tech in {normalize_technology(t) for t in techs if t}:
+                if tech:
+                    pairs.append((job_id, tech))
+        if pairs:
+            m.cursor.executemany("INSERT IGNORE INTO job_technologies (job_id, technology) VALUES (%s, %s)", pairs)
+        m.commit()
+        last_id = rows[-1][0]
+        total += len(rows)
+        print(f"🏷️ Indexed technologies for {total} jobs...")
@@ -0,0 +1,12 @@
+"""data_generation: bumped by the crawler whenever it inserts or archives jobs; readers use it to invalidate caches."""
+
+
+def up(m):
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS data_generation (
+            id TINYINT PRIMARY KEY,
+            generation BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        )
+    """)
+    m.execute("INSERT IGNORE INTO data_generation (id, generation) VALUES (1, 0)")
@@ -0,0 +1,24 @@
+"""Composite listing indexes for /jobs, replacing idx_archived_company and idx_is_winnipeg."""
+
+# Listing pages: WHERE archived = FALSE [AND <column> = ?] ORDER BY last_seen DESC, id DESC.
+# Equality on the leading columns leaves rows in (last_seen, id) order, so pages (and
+# keyset cursors) need no filesort, and COUNT(*) / facet GROUP BYs are index-only scans.
+JOB_INDEXES = {
+    "idx_archived_last_seen_id": "archived, last_seen, id",
+    "idx_archived_company_seen": "archived, company, last_seen, id",
+    "idx_archived_department_seen": "archived, department, last_seen, id",
+    "idx_archived_seniority_seen": "archived, seniority, last_seen, id",
+    "idx_archived_work_model_seen": "archived, work_model, last_seen, id",
+    "idx_archived_winnipeg_seen": "archived, is_winnipeg, last_seen, id",
+    # Incremental snapshot refresh: WHERE last_seen >= ?
+    "idx_last_seen": "last_seen",
+}
+SUPERSEDED_INDEXES = ["idx_archived_company", "idx_is_winnipeg"]
+
+
+def up(m):
+    # Build the replacements before dropping, so listings never lose their index
+    for name, columns in JOB_INDEXES.items():
+        m.add_index("jobs", name, columns)
+    for name in SUPERSEDED_INDEXES:
+        m.drop_index("jobs", name)
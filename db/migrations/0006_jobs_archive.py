@@ -0,0 +1,47 @@
+"""jobs_archive: archived postings moved out of the hot jobs table by the crawler's archiver."""
+
+
+def up(m):
+    # Same columns as jobs minus the archived flag (every row here is archived).
+    # No FULLTEXT or listing indexes: history is read by company and recency only.
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS jobs_archive (
+            id CHAR(36) PRIMARY KEY,
+
+            company VARCHAR(128) NOT NULL,
+            title TEXT NOT NULL,
+            location TEXT,
+            job_type TEXT,
+            description_html TEXT,
+            description_text MEDIUMTEXT,
+            link VARCHAR(512) UNIQUE NOT NULL,
+
+            salary_min INT,
+            salary_max INT,
+            work_model ENUM('remote', 'on-site', 'hybrid'),
+            industry TEXT,
+            seniority ENUM('entry', 'mid', 'senior', 'lead'),
+            technologies JSON,
+            is_winnipeg BOOLEAN DEFAULT FALSE,
+            department ENUM(
+                'software_engineering',
+                'management',
+                'design',
+                'marketing',
+                'sales',
+                'hr',
+                'finance',
+                'support',
+                'operations',
+                'other'
+            ),
+            min_experience INT,
+
+            date_added TIMESTAMP NULL,
+            last_seen TIMESTAMP NULL,
+            archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+            INDEX idx_archive_last_seen_id (last_seen, id),
+            INDEX idx_archive_company_seen (company, last_seen, id)
+        )
+    """)
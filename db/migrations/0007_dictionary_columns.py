@@ -0,0 +1,91 @@
+"""Dictionary-encode company, location, job_type and industry into lookup tables referenced by id."""
+
+BATCH_SIZE = 1000
+# Longest stored value; location/job_type/industry were TEXT but are short labels in practice
+NAME_LENGTH = 512
+
+# jobs column -> lookup table. The column is replaced by <column>_id.
+DICTIONARIES = {
+    "company": "companies",
+    "location": "locations",
+    "job_type": "job_types",
+    "industry": "industries",
+}
+TABLES = ["jobs", "jobs_archive"]
+
+# Listing index on company, rebuilt on company_id: (table, old, new, columns)
+COMPANY_INDEXES = [
+    ("jobs", "idx_archived_company_seen", "idx_archived_company_id_seen", "archived, company_id, last_seen, id"),
+    ("jobs_archive", "idx_archive_company_seen", "idx_archive_company_id_seen", "company_id, last_seen, id"),
+]
+
+
+def backfill(m, table: str, columns: list):
+    """Fill the dictionaries from `columns`, then set every <column>_id in one batched pass."""
+    for column in columns:
+        m.execute(f"""
+            INSERT IGNORE INTO {DICTIONARIES[column]} (name)
+            SELECT DISTINCT LEFT({column}, {NAME_LENGTH}) FROM {table} WHERE {column} IS NOT NULL
+        """)
+        m.commit()
+
+    joins = " ".join(
+        f"LEFT JOIN {DICTIONARIES[column]} d_{column} ON d_{column}.name = LEFT(t.{column}, {NAME_LENGTH})"
+        for column in columns
+    )
+    assignments = ", ".join(f"t.{column}_id = d_{column}.id" for column in columns)
+
+    last_id = ""
+    total = 0
+    while True:
+        m.execute(f"SELECT id FROM {table} WHERE id > %s ORDER BY id LIMIT %s", (last_id, BATCH_SIZE))
+        ids = [row[0] for row in m.cursor.fetchall()]
+        if not ids:
+            break
+        m.execute(f"UPDATE {table} t {joins} SET {assignments} WHERE t.id BETWEEN %s AND %s", (ids[0], ids[-1]))
+        m.commit()
+        last_id = ids[-1]
+        total += len(ids)
+        print(f"📚 Encoded {total} {table} rows...")
+
+
+def check_backfill(m, table: str):
+    """Abort before any column is dropped if a non-NULL string didn't get an id: the drop can't be undone."""
+    for column in DICTIONARIES:
+        if not m.column_exists(table, column):
+            continue
+        m.execute(f"SELECT COUNT(*) FROM {table} WHERE {column} IS NOT NULL AND {column}_id IS NULL")
+        missing = m.cursor.fetchone()[0]
+        if missing:
+            raise RuntimeError(f"{missing} {table} rows have {column} but no {column}_id, not dropping {table}.{column}")
+
+
+def up(m):
+    # Default (case-insensitive) collation, as the jobs string columns had: "neo" filters
+    # match "Neo", and "Neo" / "NEO" share one row and one facet bucket
+    for dictionary in DICTIONARIES.values():
+        m.execute(f"""
+            CREATE TABLE IF NOT EXISTS {dictionary} (
+                id INT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+                name VARCHAR({NAME_LENGTH}) NOT NULL,
+                UNIQUE INDEX idx_{dictionary}_name (name)
+            )
+        """)
+
+    for table in TABLES:
+        for column in DICTIONARIES:
+            m.add_column(table, f"{column}_id", "INT UNSIGNED")
+        columns = [column for column in DICTIONARIES if m.column_exists(table, column)]
+        if columns:
+            backfill(m, table, columns)
+
+    # Build the id index before dropping the one on the string column
+    for table, old, new, columns in COMPANY_INDEXES:
+        m.add_index(table, new, columns)
+        m.drop_index(table, old)
+
+    for table in TABLES:
+        check_backfill(m, table)
+    for table in TABLES:
+        for column in DICTIONARIES:
+            m.drop_column(table, column)
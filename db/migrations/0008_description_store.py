@@ -0,0 +1,45 @@
+"""Move description_html into job_descriptions: zlib-compressed, keyed by SHA-256 so re-posts share one row."""
+import hashlib
+import zlib
+
+BATCH_SIZE = 500
+TABLES = ["jobs", "jobs_archive"]
+
+
+def up(m):
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS job_descriptions (
+            hash BINARY(32) PRIMARY KEY,  -- SHA-256 of the UTF-8 HTML
+            body MEDIUMBLOB NOT NULL,     -- zlib-compressed HTML
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    for table in TABLES:
+        m.add_column(table, "description_hash", "BINARY(32)")
+        if not m.column_exists(table, "description_html"):
+            continue
+
+        total = 0
+        while True:
+            m.execute(f"""
+                SELECT id, description_html FROM {table}
+                WHERE description_hash IS NULL AND description_html IS NOT NULL
+                LIMIT %s
+            """, (BATCH_SIZE,))
+            rows = m.cursor.fetchall()
+            if not rows:
+                break
+            descriptions, hashes = {}, []
+            for job_id, html in rows:
+                data = html.encode("utf-8")
+                digest = hashlib.sha256(data).digest()
+                descriptions[digest] = zlib.compress(data)
+                hashes.append((digest, job_id))
+            m.cursor.executemany("INSERT IGNORE INTO job_descriptions (hash, body) VALUES (%s, %s)", list(descriptions.items()))
+            m.cursor.executemany(f"UPDATE {table} SET description_hash = %s WHERE id = %s", hashes)
+            m.commit()
+            total += len(rows)
+            print(f"🗜️ Stored {total} {table} descriptions...")
+
+        m.drop_column(table, "description_html")
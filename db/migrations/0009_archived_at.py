@@ -0,0 +1,14 @@
+"""jobs.archived_at: when a job was archived, so the archiver's grace period doesn't depend on last_seen."""
+
+
+def up(m):
+    m.add_column("jobs", "archived_at", "TIMESTAMP NULL")
+    # Jobs archived before this column: the archiving UPDATE bumped last_seen (ON UPDATE
+    # CURRENT_TIMESTAMP). Assign last_seen to itself so this UPDATE doesn't bump it again.
+    m.execute("""
+        UPDATE jobs SET archived_at = last_seen, last_seen = last_seen
+        WHERE archived = TRUE AND archived_at IS NULL
+    """)
+    m.commit()
+    # Archiver: WHERE archived = TRUE AND archived_at < ? ORDER BY archived_at
+    m.add_index("jobs", "idx_archived_archived_at", "archived, archived_at")
@@ -0,0 +1,15 @@
+"""Listing/facet indexes on job_type_id and industry_id, the two facet columns without one."""
+
+# /filters groups each facet: WHERE archived = FALSE [AND ...] GROUP BY <column>. Since
+# the archiver moves history to jobs_archive, archived = FALSE matches nearly every row
+# of jobs, so a facet column without an index of its own is grouped by a full table scan.
+# Same shape as the 0005 listing indexes, so job_type pages are served in order too.
+JOB_INDEXES = {
+    "idx_archived_job_type_id_seen": "archived, job_type_id, last_seen, id",
+    "idx_archived_industry_id_seen": "archived, industry_id, last_seen, id",
+}
+
+
+def up(m):
+    for name, columns in JOB_INDEXES.items():
+        m.add_index("jobs", name, columns)
@@ -0,0 +1,121 @@
+import os
+import json
+import zlib
+import importlib.util
+
+DB_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_module(name: str, path: str):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def rows(connect, sql: str, values=()) -> list:
+    conn = connect()
+    cursor = conn.cursor()
+    cursor.execute(sql, values)
+    result = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return result
+
+
+def columns(connect, table: str) -> set:
+    return {name for (name,) in rows(connect, """
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s
+    """, (table,))}
+
+
+def assert_final_schema(runner, connect):
+    versions = [version for version, _, _ in runner.load_migrations()]
+    assert [version for (version,) in rows(connect, "SELECT version FROM schema_migrations ORDER BY version")] == versions
+
+    for table in ("jobs", "jobs_archive"):
+        names = columns(connect, table)
+        assert {"company_id", "location_id", "job_type_id", "industry_id", "description_hash", "archived_at"} <= names
+        assert not {"company", "location", "job_type", "industry", "description_html"} & names
+    assert "description_text" in columns(connect, "jobs")
+
+
+def test_empty_database(runner, connect):
+    runner.migrate()
+    assert_final_schema(runner, connect)
+
+    # A second run has nothing to do
+    runner.migrate()
+    assert_final_schema(runner, connect)
+
+
+def pre_series_schema(connect):
+    """The tables as they were before migrations, with a few rows in them."""
+    baseline = load_module("baseline", os.path.join(DB_DIR, "migrations", "0001_baseline.py"))
+    conn = connect()
+    migration = load_module("runner", os.path.join(DB_DIR, "__init__.py")).Migration(conn)
+    baseline.up(migration)
+    migration.close()
+    cursor = conn.cursor()
+    cursor.executemany("""
+        INSERT INTO jobs (id, company, title, location, job_type, description_html, link, industry, technologies, archived)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """, [
+        ("00000000-0000-0000-0000-000000000001", "Neo", "Backend Developer", "Winnipeg, MB", "Full Time",
+         "<p>Python and Go</p>", "https://example.com/1", "Fintech", json.dumps(["Python", "Go"]), False),
+        ("00000000-0000-0000-0000-000000000002", "NEO", "Data Engineer", None, None,
+         None, "https://example.com/2", None, "not json", True),
+    ])
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def test_pre_series_database(runner, connect):
+    pre_series_schema(connect)
+    runner.migrate()
+    assert_final_schema(runner, connect)
+
+    jobs = rows(connect, """
+        SELECT j.id, c.name, l.name, t.name, i.name, j.description_text, d.body, j.archived, j.archived_at IS NOT NULL
+        FROM jobs j
+        LEFT JOIN companies c ON c.id = j.company_id
+        LEFT JOIN locations l ON l.id = j.location_id
+        LEFT JOIN job_types t ON t.id = j.job_type_id
+        LEFT JOIN industries i ON i.id = j.industry_id
+        LEFT JOIN job_descriptions d ON d.hash = j.description_hash
+        ORDER BY j.id
+    """)
+    first, second = jobs
+    assert first[1].lower() == "neo"
+    assert first[2:6] == ("Winnipeg, MB", "Full Time", "Fintech", "Python and Go")
+    assert zlib.decompress(first[6]).decode() == "<p>Python and Go</p>"
+    # Names match case-insensitively, so "Neo" and "NEO" share one row
+    assert second[1] == first[1]
+    assert second[2:7] == (None, None, None, None, None)
+    assert second[7:] == (1, 1)
+
+    assert rows(connect, "SELECT technology FROM job_technologies ORDER BY technology") == [("go",), ("python",)]
+    assert rows(connect, "SELECT COUNT(*) FROM companies") == [(1,)]
+
+
+def test_unencoded_names_block_the_drop(runner, connect):
+    pre_series_schema(connect)
+    runner.migrate(6)
+    dictionaries = load_module("dictionaries", os.path.join(DB_DIR, "migrations", "0007_dictionary_columns.py"))
+
+    # The id columns exist but were never filled
+    conn = connect()
+    migration = runner.Migration(conn)
+    for column in dictionaries.DICTIONARIES:
+        migration.add_column("jobs", f"{column}_id", "INT UNSIGNED")
+    try:
+        dictionaries.check_backfill(migration, "jobs")
+        raise AssertionError("check_backfill passed with unencoded names")
+    except RuntimeError as e:
+        assert "company_id" in str(e)
+    finally:
+        migration.close()
+        conn.close()
+    assert "company" in columns(connect, "jobs")
@@ -1,10 +1,12 @@
 const BASE_URL = import.meta.env.VITE_API_BASE_URL;
 
 export interface JobListResponse {
-  data: JobPosting[];
+  data: JobSummary[];
   total: number;
+  total_is_estimate?: boolean;
   page: number;
   page_size: number;
+  next_cursor?: string | null;
 }
 export interface JobPosting {
   id: string;
@@ -27,6 +29,11 @@ export interface JobPosting {
   last_seen: string;  // ISO string
 }
 
+// List view of a job: no description_html, a short plain-text snippet instead
+export type JobSummary = Omit<JobPosting, "description_html"> & {
+  description_snippet: string | null;
+};
+
 export interface FilterOption {
   id: string;
   label: string;
@@ -90,4 +97,22 @@ export const sendAnalytics = async (path?: string): Promise<void> => {
   if (!res.ok) {
     console.warn("Analytics failed:", await res.text());
   }
-}
\ No newline at end of file
+}
+
+// Sends queued page views in one request. Uses sendBeacon so it survives page hide.
+export const sendAnalyticsBatch = (paths: string[]): void => {
+  if (paths.length === 0) return
+  const body = JSON.stringify({ events: paths.map(path => ({ path })) })
+  const url = `${BASE_URL}/analytics/batch`
+
+  if (navigator.sendBeacon && navigator.sendBeacon(url, body)) return
+
+  fetch(url, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json"
+    },
+    body,
+    keepalive: true
+  }).catch(err => console.warn("Analytics failed:", err))
+}
@@ -1,13 +1,28 @@
 // useAnalytics.ts
 import { useEffect } from "react"
-import { sendAnalytics } from "@/applynow/data/job-postings-data"
+import { sendAnalyticsBatch } from "@/applynow/data/job-postings-data"
+
+const MAX_QUEUED = 10
+const queue: string[] = []
+let listening = false
+
+function flush() {
+  sendAnalyticsBatch(queue.splice(0, queue.length))
+}
+
+function listenForPageHide() {
+  if (listening) return
+  listening = true
+  document.addEventListener("visibilitychange", () => {
+    if (document.visibilityState === "hidden") flush()
+  })
+  window.addEventListener("pagehide", flush)
+}
 
 export function useAnalytics(path?: string) {
   useEffect(() => {
-    sendAnalytics(path).then(() => {
-    }).catch(err => {
-      // Optional: log or ignore
-      console.warn("Analytics failed:", err)
-    })
+    listenForPageHide()
+    queue.push(path || window.location.pathname)
+    if (queue.length >= MAX_QUEUED) flush()
   }, [path])
 }
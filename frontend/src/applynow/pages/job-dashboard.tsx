@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from "react";
-import { getJobPostings, getFilterOptions, JobPosting } from "@/applynow/data/job-postings-data";
+import { getJobPostings, getFilterOptions, JobSummary } from "@/applynow/data/job-postings-data";
 import { Button } from "@/components/ui/button";
 import { Separator } from "@/components/ui/separator";
 import {
@@ -42,7 +42,7 @@ const JobCardSkeleton = () => (
 );
 
 export default function JobDashboard() {
-  const [jobs, setJobs] = useState<JobPosting[]>([]);
+  const [jobs, setJobs] = useState<JobSummary[]>([]);
   const [activeFilters, setActiveFilters] = useState<{
     seniority: string[];
     jobTypes: string[];
@@ -308,7 +308,7 @@ export default function JobDashboard() {
                       id={job.id}
                       title={job.title}
                       company={job.company}
-                      description={job.description_html}
+                      description={job.description_snippet ?? ""}
                       experienceLevel={SENIORITY_BACK_TO_FRONT_MAP[job.seniority] as 'Entry' | 'Mid' | 'Senior' | 'Lead'}
                       location={job.location}
                       locationType={WORK_MODEL_MAP[job.work_model]}
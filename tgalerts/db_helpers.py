@@ -54,9 +54,16 @@ def mark_notifications_sent(job_ids: List[str]):
 def get_job_by_id(job_id: str) -> dict:
     conn = get_connection()
     cursor = conn.cursor(dictionary=True)
+    # company/location/... are ids into lookup tables; alerts need the names
     cursor.execute("""
-        SELECT * FROM jobs
-        WHERE id = %s
+        SELECT
+            j.*,
+            (SELECT name FROM companies WHERE companies.id = j.company_id) AS company,
+            (SELECT name FROM locations WHERE locations.id = j.location_id) AS location,
+            (SELECT name FROM job_types WHERE job_types.id = j.job_type_id) AS job_type,
+            (SELECT name FROM industries WHERE industries.id = j.industry_id) AS industry
+        FROM jobs j
+        WHERE j.id = %s
     """, (job_id,))
     row = cursor.fetchone()
     conn.close()
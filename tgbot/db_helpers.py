@@ -101,7 +101,10 @@ def get_filter_field(user_id: int, field: str) -> List[str]:
 def get_distinct_companies() -> List[str]:
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT DISTINCT company FROM jobs WHERE archived = FALSE")
+    cursor.execute("""
+        SELECT name FROM companies
+        WHERE id IN (SELECT company_id FROM jobs WHERE archived = FALSE)
+    """)
     return sorted([row[0] for row in cursor.fetchall()])
 
 def get_distinct_work_models() -> List[str]: